@@ -13,6 +13,7 @@ import pandas as pd
 from library import chembl_library as cl
 from library import iuphar_library as ii
 from library import uniprot_library as uu
+from library.uniprot_release import UniProtRelease
 
 logger = logging.getLogger(__name__)
 
@@ -147,8 +148,71 @@ def build_parser() -> argparse.ArgumentParser:
         default="uniprot",
         help="Directory containing '<uniprot_id>.json' files",
     )
+    uniprot.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Decode cached UniProt JSON selectively (requires ijson)",
+    )
+    uniprot.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent downloads of UniProt entries missing from --data-dir",
+    )
+    uniprot.add_argument(
+        "--lock-cache",
+        action="store_true",
+        help="Lock shared UniProt cache files; use when runs share --data-dir",
+    )
+    uniprot.add_argument(
+        "--projected",
+        action="store_true",
+        help="Download only the UniProt fields the extractors read",
+    )
+    uniprot.add_argument(
+        "--resolve-accessions",
+        action="store_true",
+        help="Map obsolete or merged UniProt accessions to current primaries",
+    )
+    uniprot.add_argument(
+        "--release",
+        type=Path,
+        default=None,
+        help="Read entries from a local UniProt JSON-lines release instead of the API",
+    )
+    uniprot.add_argument(
+        "--output-format",
+        choices=uu.OUTPUT_FORMATS,
+        default="csv",
+        help="Write CSV or Parquet (typed columns; requires pyarrow)",
+    )
     uniprot.set_defaults(func=run_uniprot)
 
+    # ----------------------------
+    # UniProt cache refresh
+    # ----------------------------
+    refresh = subparsers.add_parser(
+        "uniprot-refresh",
+        help="Re-download cached UniProt entries whose version changed",
+    )
+    refresh.add_argument(
+        "report_csv",
+        type=Path,
+        help="Destination CSV listing updated, merged and obsolete accessions",
+    )
+    refresh.add_argument(
+        "--data-dir",
+        default="uniprot",
+        help="Directory containing '<uniprot_id>.json' files",
+    )
+    refresh.add_argument("--sep", default=",", help="CSV delimiter for output")
+    refresh.add_argument(
+        "--encoding",
+        default="utf8",
+        help="File encoding for the output CSV file",
+    )
+    refresh.set_defaults(func=run_uniprot_refresh)
+
     # ----------------------------
     # ChEMBL sub-command
     # ----------------------------
@@ -254,6 +318,38 @@ def build_parser() -> argparse.ArgumentParser:
         default="uniprot",
         help="Directory containing '<uniprot_id>.json' files",
     )
+    all_cmd.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Decode cached UniProt JSON selectively (requires ijson)",
+    )
+    all_cmd.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent downloads of UniProt entries missing from --data-dir",
+    )
+    all_cmd.add_argument(
+        "--lock-cache",
+        action="store_true",
+        help="Lock shared UniProt cache files; use when runs share --data-dir",
+    )
+    all_cmd.add_argument(
+        "--projected",
+        action="store_true",
+        help="Download only the UniProt fields the extractors read",
+    )
+    all_cmd.add_argument(
+        "--resolve-accessions",
+        action="store_true",
+        help="Map obsolete or merged UniProt accessions to current primaries",
+    )
+    all_cmd.add_argument(
+        "--release",
+        type=Path,
+        default=None,
+        help="Read entries from a local UniProt JSON-lines release instead of the API",
+    )
     all_cmd.add_argument(
         "--target-csv",
         type=Path,
@@ -299,6 +395,23 @@ def configure_logging(level: str) -> None:
     logging.basicConfig(level=getattr(logging, level.upper(), logging.INFO))
 
 
+def _uniprot_options(args: argparse.Namespace) -> dict[str, object]:
+    """Return the UniProt retrieval options shared by ``uniprot`` and ``all``.
+
+    The mapping holds the keyword arguments that
+    :func:`library.uniprot_library.collect_records` and
+    :func:`library.uniprot_library.process` both accept.
+    """
+
+    return {
+        "streaming": args.streaming,
+        "workers": args.workers,
+        "lock": args.lock_cache,
+        "fields": uu.EXTRACTOR_FIELDS if args.projected else None,
+        "resolve": args.resolve_accessions,
+    }
+
+
 def run_uniprot(args: argparse.Namespace) -> int:
     """Execute the ``uniprot`` sub-command.
 
@@ -330,22 +443,35 @@ def run_uniprot(args: argparse.Namespace) -> int:
                     writer.writerow({"uniprot_id": uid})
                 input_csv = Path(tmp.name)
 
-        uu.process(
-            input_csv=str(input_csv),
-            output_csv=str(args.output_csv),
-            data_dir=str(args.data_dir),
-            sep=args.sep,
-            encoding=args.encoding,
-        )
+        release = UniProtRelease(str(args.release)) if args.release else None
+        try:
+            uu.process(
+                input_csv=str(input_csv),
+                output_csv=str(args.output_csv),
+                data_dir=str(args.data_dir),
+                sep=args.sep,
+                encoding=args.encoding,
+                release=release,
+                output_format=args.output_format,
+                **_uniprot_options(args),
+            )
+        finally:
+            if release is not None:
+                release.close()
 
         if args.column != "uniprot_id":
-            out_df = pd.read_csv(
-                args.output_csv, sep=args.sep, encoding=args.encoding, dtype=str
-            )
-            out_df.insert(1, args.column, ids)
-            out_df.to_csv(
-                args.output_csv, index=False, sep=args.sep, encoding=args.encoding
-            )
+            if args.output_format == "parquet":
+                out_df = pd.read_parquet(args.output_csv)
+                out_df.insert(1, args.column, ids)
+                out_df.to_parquet(args.output_csv, index=False)
+            else:
+                out_df = pd.read_csv(
+                    args.output_csv, sep=args.sep, encoding=args.encoding, dtype=str
+                )
+                out_df.insert(1, args.column, ids)
+                out_df.to_csv(
+                    args.output_csv, index=False, sep=args.sep, encoding=args.encoding
+                )
             input_csv.unlink(missing_ok=True)
         return 0
     except (FileNotFoundError, ValueError, OSError) as exc:
@@ -353,6 +479,30 @@ def run_uniprot(args: argparse.Namespace) -> int:
         return 1
 
 
+def run_uniprot_refresh(args: argparse.Namespace) -> int:
+    """Execute the ``uniprot-refresh`` sub-command."""
+
+    report = uu.refresh_cache(str(args.data_dir))
+    fieldnames = [
+        "uniprot_id",
+        "status",
+        "current_accession",
+        "cached_version",
+        "current_version",
+    ]
+    try:
+        with Path(args.report_csv).open(
+            "w", encoding=args.encoding, newline=""
+        ) as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames, delimiter=args.sep)
+            writer.writeheader()
+            writer.writerows(report)
+    except OSError as exc:
+        logger.error("failed to write report CSV: %s", exc)
+        return 1
+    return 0
+
+
 def run_chembl(args: argparse.Namespace) -> int:
     """Execute the ``chembl`` sub-command."""
 
@@ -394,9 +544,26 @@ def run_iuphar(args: argparse.Namespace) -> int:
         return 1
 
 
+def _write_intermediate(
+    df: pd.DataFrame, path: Path | None, args: argparse.Namespace
+) -> None:
+    """Write the intermediate table ``df`` to ``path`` when one is given."""
+
+    if path is None:
+        return
+    try:
+        df.to_csv(path, index=False, sep=args.sep, encoding=args.encoding)
+    except OSError as exc:
+        raise OSError(f"failed to write intermediate CSV: {path}: {exc}") from exc
+
+
 def run_all(args: argparse.Namespace) -> int:
     """Run ChEMBL, UniProt and IUPHAR pipelines and merge their outputs.
 
+    The stages hand their tables to each other in memory. Intermediate
+    results are written only when ``--chembl-out``, ``--uniprot-out`` or
+    ``--iuphar-out`` is given.
+
     Parameters
     ----------
     args:
@@ -408,74 +575,43 @@ def run_all(args: argparse.Namespace) -> int:
         Zero on success, non-zero on failure.
     """
 
+    uniprot_column = args.uniprot_column
+    release = None
     try:
-        # Determine intermediate output paths
-        chembl_out = args.chembl_out or args.output_csv.with_name(
-            args.output_csv.stem + "_chembl.csv"
-        )
-        uniprot_out = args.uniprot_out or args.output_csv.with_name(
-            args.output_csv.stem + "_uniprot.csv"
-        )
-        iuphar_out = args.iuphar_out or args.output_csv.with_name(
-            args.output_csv.stem + "_iuphar.csv"
-        )
-
-        # Run ChEMBL retrieval and capture results
-        chembl_args = argparse.Namespace(
-            input_csv=args.input_csv,
-            output_csv=chembl_out,
-            column="chembl_id",
-            sep=args.sep,
-            encoding=args.encoding,
+        # Run ChEMBL retrieval
+        ids = read_ids(
+            args.input_csv, column="chembl_id", sep=args.sep, encoding=args.encoding
         )
-        if run_chembl(chembl_args) != 0:
-            return 1
-        chembl_df = pd.read_csv(
-            chembl_out, sep=args.sep, encoding=args.encoding, dtype=str
-        ).rename(columns={"target_chembl_id": "chembl_id"})
+        chembl_df = cl.get_targets(ids)
+        _write_intermediate(chembl_df, args.chembl_out, args)
+        chembl_df = chembl_df.rename(columns={"target_chembl_id": "chembl_id"})
 
-        # Extract UniProt IDs and write temporary CSV for downstream steps
         uids = [
             u
-            for u in chembl_df.get(args.uniprot_column, [])
+            for u in chembl_df.get(uniprot_column, [])
             if isinstance(u, str) and u
         ]
-        from tempfile import NamedTemporaryFile
-
-        with NamedTemporaryFile("w", delete=False, encoding=args.encoding, newline="") as tmp:
-            writer = csv.DictWriter(tmp, fieldnames=["uniprot_id"], delimiter=args.sep)
-            writer.writeheader()
-            for uid in uids:
-                writer.writerow({"uniprot_id": uid})
-            tmp_path = Path(tmp.name)
-
-        # Run UniProt pipeline
-        uniprot_args = argparse.Namespace(
-            input_csv=tmp_path,
-            output_csv=uniprot_out,
-            data_dir=args.data_dir,
-            sep=args.sep,
-            encoding=args.encoding,
-            column="uniprot_id",
+        # Run UniProt pipeline on the accessions of the ChEMBL targets
+        release = UniProtRelease(str(args.release)) if args.release else None
+        fieldnames, rows = uu.collect_records(
+            uids,
+            str(args.data_dir),
+            release=release,
+            **_uniprot_options(args),
         )
-        try:
-            if run_uniprot(uniprot_args) != 0:
-                return 1
-        finally:
-            tmp_path.unlink(missing_ok=True)
-
-        # Load UniProt output
-        uniprot_df = pd.read_csv(
-            uniprot_out, sep=args.sep, encoding=args.encoding, dtype=str
-        )
-        if args.uniprot_column != "uniprot_id":
-            uniprot_df[args.uniprot_column] = uniprot_df["uniprot_id"]
+        for info in rows:
+            info["secondaryAccessions"] = "|".join(info.get("secondaryAccessions", []))
+        uniprot_df = pd.DataFrame.from_records(rows, columns=fieldnames)
+        _write_intermediate(uniprot_df, args.uniprot_out, args)
+        # Taxonomy values repeat across targets; store each distinct one once.
+        for column in uu.CATEGORY_COLUMNS.intersection(uniprot_df.columns):
+            uniprot_df[column] = uniprot_df[column].astype("category")
+        if uniprot_column != "uniprot_id":
+            uniprot_df[uniprot_column] = uniprot_df["uniprot_id"]
 
         # Prepare combined input for IUPHAR containing ChEMBL and UniProt data
-        combined_df = chembl_df.merge(
-            uniprot_df, on=args.uniprot_column, how="left"
-        )
-        
+        combined_df = chembl_df.merge(uniprot_df, on=uniprot_column, how="left")
+
         # Consolidate synonym and EC number information for classification
         combined_df["synonyms"] = combined_df.apply(
             lambda r: _pipe_merge(
@@ -497,38 +633,25 @@ def run_all(args: argparse.Namespace) -> int:
         combined_df["gene_name"] = combined_df["gene"].apply(_first_token)
         combined_df = combined_df.drop(columns=["ec_numbers", "reaction_ec_numbers"], errors="ignore")
 
-        with NamedTemporaryFile(
-            "w", delete=False, encoding=args.encoding, newline=""
-        ) as tmp:
-            combined_df.to_csv(tmp, index=False, sep=args.sep, encoding=args.encoding)
-            iuphar_input = Path(tmp.name)
-
         # Run IUPHAR mapping using combined data
-        iuphar_args = argparse.Namespace(
-            input_csv=iuphar_input,
-            output_csv=iuphar_out,
-            target_csv=args.target_csv,
-            family_csv=args.family_csv,
-            sep=args.sep,
+        data = ii.IUPHARData.from_files(
+            target_path=args.target_csv,
+            family_path=args.family_csv,
             encoding=args.encoding,
         )
-        try:
-            if run_iuphar(iuphar_args) != 0:
-                return 1
-        finally:
-            iuphar_input.unlink(missing_ok=True)
-
-        # Merge results using pandas
+        iuphar_df = data.map_uniprot_df(combined_df)
+        _write_intermediate(iuphar_df, args.iuphar_out, args)
 
-        iuphar_df = pd.read_csv(
-            iuphar_out, sep=args.sep, encoding=args.encoding, dtype=str
-        )
+        # The mapping keeps the row order of ``combined_df``, so its new
+        # columns are joined on the index.
         existing_cols = set(chembl_df.columns) | set(uniprot_df.columns)
         classification_cols = [c for c in iuphar_df.columns if c not in existing_cols]
-
-        iuphar_df = iuphar_df[["uniprot_id", *classification_cols]]
-
-        merged = combined_df.merge(iuphar_df, on="uniprot_id", how="left")
+        merged = combined_df.merge(
+            iuphar_df[classification_cols],
+            left_index=True,
+            right_index=True,
+            how="left",
+        )
 
         merged.to_csv(
             args.output_csv, index=False, sep=args.sep, encoding=args.encoding
@@ -537,6 +660,9 @@ def run_all(args: argparse.Namespace) -> int:
     except (FileNotFoundError, ValueError, OSError) as exc:
         logger.error("%s", exc)
         return 1
+    finally:
+        if release is not None:
+            release.close()
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -45,6 +45,8 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from . import json_library as _jl
+
 # Configure module level logger
 logger = logging.getLogger(__name__)
 
@@ -124,7 +126,7 @@ def _map_chembl_to_uniprot(chembl_id: str) -> str:
             timeout=30,
         )
         resp.raise_for_status()
-        job_id = resp.json().get("jobId")
+        job_id = _jl.response_json(resp).get("jobId")
         if not job_id:
             return ""
         status_url = f"https://rest.uniprot.org/idmapping/status/{job_id}"
@@ -132,11 +134,11 @@ def _map_chembl_to_uniprot(chembl_id: str) -> str:
         for _ in range(10):
             status_resp = _session.get(status_url, timeout=30)
             status_resp.raise_for_status()
-            status = status_resp.json()
+            status = _jl.response_json(status_resp)
             if status.get("jobStatus") == "FINISHED":
                 result_resp = _session.get(result_url, timeout=30)
                 result_resp.raise_for_status()
-                data = result_resp.json()
+                data = _jl.response_json(result_resp)
                 items = data.get("results") or []
                 if items:
                     return items[0].get("to", "")
@@ -295,7 +297,7 @@ def get_target(chembl_target_id: str) -> dict[str, Any]:
         return dict(EMPTY_TARGET)
 
     try:
-        data = response.json()
+        data = _jl.response_json(response)
     except ValueError as exc:  # pragma: no cover - malformed JSON
         logger.warning("Failed to decode JSON for target %s: %s", chembl_target_id, exc)
         return dict(EMPTY_TARGET)
@@ -337,7 +339,7 @@ def get_targets(ids: Iterable[str], chunk_size: int = 5) -> pd.DataFrame:
             continue
 
         try:
-            data = response.json()
+            data = _jl.response_json(response)
         except ValueError as exc:  # pragma: no cover - malformed JSON
             logger.warning("Failed to decode JSON for targets %s: %s", chunk, exc)
             continue
@@ -417,7 +419,7 @@ def get_assay(chembl_assay_id: str) -> pd.DataFrame:
         return pd.DataFrame(columns=ASSAY_COLUMNS)
 
     try:
-        data = response.json()
+        data = _jl.response_json(response)
     except ValueError as exc:  # pragma: no cover - malformed JSON
         logger.warning("Failed to decode JSON for assay %s: %s", chembl_assay_id, exc)
         return pd.DataFrame(columns=ASSAY_COLUMNS)
@@ -459,7 +461,7 @@ def get_assays_all(ids: Iterable[str], chunk_size: int = 5) -> pd.DataFrame:
             continue
 
         try:
-            data = response.json()
+            data = _jl.response_json(response)
         except ValueError as exc:  # pragma: no cover - malformed JSON
             logger.warning("Failed to decode JSON for assays %s: %s", chunk, exc)
             continue
@@ -512,7 +514,7 @@ def get_assays_notNull(ids: Iterable[str], chunk_size: int = 5) -> pd.DataFrame:
             continue
 
         try:
-            data = response.json()
+            data = _jl.response_json(response)
         except ValueError as exc:  # pragma: no cover - malformed JSON
             logger.warning("Failed to decode JSON for assays %s: %s", chunk, exc)
             continue
@@ -595,7 +597,7 @@ def get_activities(
             continue
 
         try:
-            data = response.json()
+            data = _jl.response_json(response)
         except ValueError as exc:  # pragma: no cover - malformed JSON
             logger.warning("Failed to decode JSON for activities %s: %s", chunk, exc)
             continue
@@ -667,7 +669,7 @@ def get_testitem(ids: Iterable[str], chunk_size: int = 5) -> pd.DataFrame:
             continue
 
         try:
-            data = response.json()
+            data = _jl.response_json(response)
         except ValueError as exc:  # pragma: no cover - malformed JSON
             logger.warning("Failed to decode JSON for molecules %s: %s", chunk, exc)
             continue
@@ -734,7 +736,7 @@ def get_document(chembl_document_id: str) -> pd.DataFrame:
         return pd.DataFrame(columns=DOCUMENT_COLUMNS)
 
     try:
-        data = response.json()
+        data = _jl.response_json(response)
     except ValueError as exc:  # pragma: no cover - malformed JSON
         logger.warning(
             "Failed to decode JSON for document %s: %s", chembl_document_id, exc
@@ -778,7 +780,7 @@ def get_documents(ids: Iterable[str], chunk_size: int = 5) -> pd.DataFrame:
             continue
 
         try:
-            data = response.json()
+            data = _jl.response_json(response)
         except ValueError as exc:  # pragma: no cover - malformed JSON
             logger.warning("Failed to decode JSON for documents %s: %s", chunk, exc)
             continue
@@ -13,21 +13,49 @@ comments to aid maintenance.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import functools
+import hashlib
+import json
 import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from . import json_library as _jl
 
-logger = logging.getLogger(__name__)
 
+logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent requests issued by :meth:`IUPHARData.websearch_genes`.
+WEBSEARCH_MAX_WORKERS = 8
 
+# Shared HTTP session with retry/backoff, pooled for concurrent web searches.
+_retry = Retry(
+    total=3,
+    backoff_factor=1.0,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+)
+_session = requests.Session()
+_adapter = HTTPAdapter(max_retries=_retry, pool_maxsize=WEBSEARCH_MAX_WORKERS)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
 
+# Bumped whenever the pickled layout of :class:`IUPHARData` changes so stale
+# compiled indexes are rebuilt rather than loaded.
+_INDEX_VERSION = 1
 
 
 EXPECTED_TARGET_COLUMNS: tuple[str, ...] = (
@@ -133,12 +161,403 @@ def load_families(path: str | Path, *, encoding: str = "utf-8") -> pd.DataFrame:
     return df
 
 
+def _multimap(keys: pd.Series, values: pd.Series) -> Dict[Any, List[str]]:
+    """Map each key to its distinct string values in order of appearance.
+
+    Missing keys and values are skipped, matching a boolean mask followed by
+    ``dropna().astype(str).unique()``.
+    """
+
+    index: Dict[Any, List[str]] = {}
+    for key, value in zip(keys, values):
+        if pd.isna(key) or pd.isna(value):
+            continue
+        ids = index.setdefault(key, [])
+        value = str(value)
+        if value not in ids:
+            ids.append(value)
+    return index
+
+
+def _first_positions(keys: Iterable[Any]) -> Dict[Any, int]:
+    """Map each non-missing key to the position of its first row."""
+
+    index: Dict[Any, int] = {}
+    for pos, key in enumerate(keys):
+        if not pd.isna(key):
+            index.setdefault(key, pos)
+    return index
+
+
+def _family_closure(parents: Dict[Any, str]) -> Dict[Any, tuple[str, ...]]:
+    """Return the ancestor chain, starting with itself, of every family.
+
+    ``parents`` maps each family to its parent ID or ``""`` for roots. A
+    parent missing from ``parents`` ends the chain after that parent. Cyclic
+    links are reported and cut where the chain would repeat a family.
+    """
+
+    chains: Dict[Any, tuple[str, ...]] = {}
+    for start in parents:
+        path: List[Any] = []
+        seen: Dict[Any, int] = {}
+        current = start
+        tail: tuple[str, ...] = ()
+        while current and current not in chains:
+            if current in seen:
+                cycle = seen[current]
+                logger.warning(
+                    "IUPHAR family hierarchy contains a cycle: %s",
+                    ">".join(map(str, path[cycle:] + [current])),
+                )
+                # Each family on the cycle lists the others once, in order.
+                for i in range(cycle, len(path)):
+                    chains[path[i]] = tuple(path[i:] + path[cycle:i])
+                path = path[:cycle]
+                tail = chains[current]
+                break
+            seen[current] = len(path)
+            path.append(current)
+            current = parents.get(current, "") if current in parents else ""
+        else:
+            if current:
+                tail = chains[current]
+        for i in range(len(path) - 1, -1, -1):
+            tail = (path[i],) + tail
+            chains[path[i]] = tail
+    return chains
+
+
+class _SubstringIndex:
+    """Case-insensitive literal substring search over a column of strings.
+
+    Texts are indexed by their character trigrams. A query only verifies the
+    rows holding its rarest trigrams instead of scanning every row. Matching
+    follows ``Series.str.contains(pattern, case=False, regex=False)``:
+    both sides are upper-cased and non-string values never match.
+    """
+
+    _N = 3
+
+    def __init__(self, texts: Iterable[Any]) -> None:
+        self._texts = [t.upper() if isinstance(t, str) else "" for t in texts]
+        postings: Dict[str, List[int]] = {}
+        n = self._N
+        for pos, text in enumerate(self._texts):
+            for gram in {text[i : i + n] for i in range(len(text) - n + 1)}:
+                postings.setdefault(gram, []).append(pos)
+        self._postings = postings
+
+    def find(self, pattern: str) -> List[int]:
+        """Return the positions of texts containing ``pattern``, in order."""
+
+        key = pattern.upper()
+        n = self._N
+        if len(key) < n:
+            return [pos for pos, text in enumerate(self._texts) if key in text]
+        grams = {key[i : i + n] for i in range(len(key) - n + 1)}
+        lists = sorted((self._postings.get(gram, []) for gram in grams), key=len)
+        candidates = set(lists[0])
+        # Two more posting lists usually leave only true matches to verify.
+        for other in lists[1:3]:
+            candidates.intersection_update(other)
+        texts = self._texts
+        return sorted(pos for pos in candidates if key in texts[pos])
+
+
+def _file_digest(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of the file at ``path``."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_compiled(path: Path, key: tuple) -> Optional["IUPHARData"]:
+    """Return the :class:`IUPHARData` pickled at ``path`` if its key matches."""
+
+    try:
+        with open(path, "rb") as handle:
+            stored_key, data = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except (
+        OSError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        ValueError,
+    ) as exc:
+        logger.warning("ignoring unreadable IUPHAR index %s: %s", path, exc)
+        return None
+    if stored_key != key or not isinstance(data, IUPHARData):
+        return None
+    return data
+
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` so readers never observe a partial file.
+
+    The bytes go to a temporary file in the same directory, which is then
+    renamed over ``path``. On failure the temporary file is removed and the
+    error is raised.
+    """
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _save_compiled(path: Path, key: tuple, data: "IUPHARData") -> None:
+    """Atomically pickle ``data`` with ``key`` to ``path``; failures are logged.
+
+    The index is only an optimisation, so neither serialisation nor write
+    errors are raised.
+    """
+
+    try:
+        _write_bytes_atomic(
+            path, pickle.dumps((key, data), protocol=pickle.HIGHEST_PROTOCOL)
+        )
+    except (OSError, pickle.PicklingError, TypeError, RecursionError) as exc:
+        logger.warning("unable to write IUPHAR index %s: %s", path, exc)
+
+
+WEBSEARCH_URL = "https://www.guidetopharmacology.org/services/targets/"
+# Cache of gene symbol searches inside the IUPHAR data directory; symbols
+# without a hit are stored with an empty result.
+WEBSEARCH_CACHE_FILE = "websearch_genes.json"
+
+
+class _RateLimiter:
+    """Space calls to :meth:`wait` at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _websearch_gene(
+    gene_name: str, session: Any = None, timeout: float = 10.0
+) -> Optional[Dict[str, Any]]:
+    """Return the first GtoPdb target for ``gene_name``.
+
+    An empty dictionary means the service has no such target; ``None``
+    means the request failed.
+    """
+
+    try:
+        response = (session or _session).get(
+            WEBSEARCH_URL, params={"geneSymbol": gene_name}, timeout=timeout
+        )
+        if response.status_code == 404:
+            return {}
+        response.raise_for_status()
+        data = _jl.response_json(response)
+    except (requests.RequestException, ValueError) as exc:
+        logger.error("IUPHAR web request for %s failed: %s", gene_name, exc)
+        return None
+    return data[0] if data else {}
+
+
+IUPHAR_MAPPING_BASE_URL = "https://www.guidetopharmacology.org/DATA/"
+IUPHAR_UNIPROT_MAPPING = "GtP_to_UniProt_mapping.csv"
+IUPHAR_HGNC_MAPPING = "GtP_to_HGNC_mapping.csv"
+
+
+def mirror_mapping_file(
+    name: str,
+    data_dir: str | Path = "data",
+    *,
+    base_url: str = IUPHAR_MAPPING_BASE_URL,
+    offline: bool = False,
+    session: Any = None,
+    timeout: float = 30.0,
+) -> Path:
+    """Return a local copy of the IUPHAR download ``name``, refreshing it if stale.
+
+    The file is kept in ``data_dir`` together with a ``<name>.meta.json``
+    sidecar holding the ``ETag`` and ``Last-Modified`` headers of the last
+    download. Later calls send a conditional request and only download the
+    file again when the server reports a change. If the server cannot be
+    reached, the existing copy is used.
+
+    Parameters
+    ----------
+    name:
+        File name below ``base_url``, e.g. :data:`IUPHAR_UNIPROT_MAPPING`.
+    data_dir:
+        Directory holding the mirror. Created when missing.
+    base_url:
+        Location of the IUPHAR downloads.
+    offline:
+        Use the local copy without contacting the server.
+    session:
+        Optional :class:`requests.Session` used for the request.
+    timeout:
+        Request timeout in seconds.
+
+    Raises
+    ------
+    FileNotFoundError
+        In offline mode when no local copy exists.
+    requests.RequestException
+        When the download fails and no local copy exists.
+    """
+
+    data_dir = Path(data_dir)
+    path = data_dir / name
+    meta_path = data_dir / f"{name}.meta.json"
+    if offline:
+        if not path.exists():
+            raise FileNotFoundError(f"{path} is not mirrored; run once without offline mode")
+        return path
+
+    meta: Dict[str, str] = {}
+    if path.exists():
+        try:
+            with open(meta_path, "rb") as handle:
+                meta = _jl.load(handle)
+        except (OSError, ValueError):
+            meta = {}
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    url = base_url + name
+    try:
+        response = (session or _session).get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and path.exists():
+            logger.debug("%s is up to date", path)
+            return path
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        if not path.exists():
+            raise
+        logger.warning("unable to revalidate %s, using local copy: %s", url, exc)
+        return path
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    _write_bytes_atomic(path, response.content)
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+    }
+    _write_bytes_atomic(meta_path, json.dumps(meta).encode())
+    logger.info("downloaded %s to %s", url, path)
+    return path
+
+
 @dataclass
 class IUPHARData:
-    """Container for IUPHAR target and family data."""
+    """Container for IUPHAR target and family data.
+
+    Hash indexes over the identifier columns are built on construction so
+    lookups do not scan the tables. Call :meth:`build_indexes` after
+    modifying ``target_df`` or ``family_df`` in place.
+    """
 
     target_df: pd.DataFrame
     family_df: pd.DataFrame
+    _target_ids: Dict[str, Dict[Any, List[str]]] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _target_rows: Dict[Any, int] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _family_rows: Dict[Any, int] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _family_rows_by_target: Dict[str, int] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _family_chains: Dict[Any, tuple[str, ...]] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _family_name_paths: Dict[Any, tuple[str, ...]] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _synonym_index: _SubstringIndex = field(
+        init=False, repr=False, compare=False, default=None
+    )
+    _target_families: Dict[Any, str] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _target_id_values: List[Any] = field(
+        init=False, repr=False, compare=False, default_factory=list
+    )
+
+    def __post_init__(self) -> None:
+        self.build_indexes()
+
+    def build_indexes(self) -> None:
+        """(Re)build the lookup indexes from ``target_df`` and ``family_df``."""
+
+        targets = self.target_df
+        self._target_ids = {
+            column: _multimap(targets[column], targets["target_id"])
+            for column in ("uniprot_id", "hgnc_name", "hgnc_id", "gene_name")
+            if column in targets.columns
+        }
+        self._target_rows = _first_positions(targets["target_id"])
+        self._target_id_values = targets["target_id"].tolist()
+        self._synonym_index = _SubstringIndex(
+            targets["synonyms"] if "synonyms" in targets.columns else ()
+        )
+        if "family_id" in targets.columns:
+            family_ids = targets["family_id"]
+            self._target_families = {
+                key: str(family_ids.iat[pos]) if pd.notna(family_ids.iat[pos]) else ""
+                for key, pos in self._target_rows.items()
+            }
+        families = self.family_df
+        self._family_rows = _first_positions(families["family_id"])
+        parents = families["parent_family_id"]
+        self._family_chains = _family_closure(
+            {
+                key: str(parents.iat[pos]) if pd.notna(parents.iat[pos]) else ""
+                for key, pos in self._family_rows.items()
+            }
+        )
+        # Name paths skip the generic "Enzyme" level and unknown families.
+        names = families["family_name"]
+        labels = {}
+        for key, pos in self._family_rows.items():
+            name = names.iat[pos]
+            if isinstance(name, str) and name and name.lower() != "enzyme":
+                labels[key] = name
+        self._family_name_paths = {
+            key: tuple(labels[fid] for fid in chain if fid in labels)
+            for key, chain in self._family_chains.items()
+        }
+        by_target: Dict[str, int] = {}
+        for pos, ids in enumerate(families["target_id"].fillna("")):
+            for tid in str(ids).split("|"):
+                by_target.setdefault(tid, pos)
+        self._family_rows_by_target = by_target
 
     @classmethod
     def from_files(
@@ -147,12 +566,48 @@ class IUPHARData:
         family_path: str | Path,
         *,
         encoding: str = "utf-8",
+        index_path: str | Path | None = None,
+        use_index: bool = True,
     ) -> "IUPHARData":
-        """Load CSV files and return an :class:`IUPHARData` instance."""
+        """Load CSV files and return an :class:`IUPHARData` instance.
+
+        The parsed tables together with their lookup indexes, family closure
+        and synonym matcher are pickled to a compiled index keyed by the
+        SHA-256 digests of both files. Later calls load that index instead of
+        parsing when neither file has changed.
 
-        target_df = load_targets(target_path, encoding=encoding)
-        family_df = load_families(family_path, encoding=encoding)
-        return cls(target_df=target_df, family_df=family_df)
+        Parameters
+        ----------
+        target_path, family_path:
+            The ``_IUPHAR_target.csv`` and ``_IUPHAR_family.csv`` files.
+        encoding:
+            File encoding. Defaults to UTF-8.
+        index_path:
+            Location of the compiled index. Defaults to
+            ``<target_path>.index.pkl``.
+        use_index:
+            Set to ``False`` to always parse the CSV files and leave any
+            compiled index untouched.
+        """
+
+        if not use_index:
+            target_df = load_targets(target_path, encoding=encoding)
+            family_df = load_families(family_path, encoding=encoding)
+            return cls(target_df=target_df, family_df=family_df)
+        index_path = Path(index_path or f"{target_path}.index.pkl")
+        key = (
+            _INDEX_VERSION,
+            pd.__version__,
+            encoding,
+            _file_digest(target_path),
+            _file_digest(family_path),
+        )
+        data = _load_compiled(index_path, key)
+        if data is not None:
+            return data
+        data = cls.from_files(target_path, family_path, encoding=encoding, use_index=False)
+        _save_compiled(index_path, key, data)
+        return data
 
     # ------------------------------------------------------------------
     # Chain-related helpers
@@ -161,24 +616,27 @@ class IUPHARData:
     def family_chain(self, start_id: str) -> List[str]:
         """Return the family hierarchy starting from *start_id*.
 
-        The chain is built by following ``parent_family_id`` links until a
-        root family is reached.
+        The chain follows ``parent_family_id`` links until a root family is
+        reached and is looked up from the closure computed by
+        :meth:`build_indexes`.
         """
 
-        chain: List[str] = []
-        current = start_id
-        while current:
-            chain.append(current)
-            parent_series = self.family_df.loc[
-                self.family_df["family_id"] == current, "parent_family_id"
-            ]
-            if parent_series.empty:
-                break
-            parent = str(parent_series.iloc[0]) if pd.notna(parent_series.iloc[0]) else ""
-            if not parent:
-                break
-            current = parent
-        return chain
+        if not start_id:
+            return []
+        return list(self._family_chains.get(start_id, (start_id,)))
+
+    def family_name_path(self, family_id: str) -> List[str]:
+        """Return the family names along the chain of *family_id*.
+
+        The generic ``Enzyme`` level is omitted.
+        """
+
+        return list(self._family_name_paths.get(family_id, ()))
+
+    def family_depth(self, family_id: str) -> int:
+        """Return the number of ancestors of *family_id* (zero for roots)."""
+
+        return max(len(self.family_chain(family_id)) - 1, 0)
 
     def all_id(self, target_id: str) -> str:
         """Return the full family ID path for a target."""
@@ -193,14 +651,7 @@ class IUPHARData:
         family_id = self.from_target_family_id(target_id)
         if not family_id:
             return ""
-        chain = []
-        for fam_id in self.family_chain(family_id):
-            record = self.from_family_record(fam_id)
-            if record is None:
-                continue
-            name = record.get("family_name")
-            if name and name.lower() not in {"enzyme"}:
-                chain.append(name)
+        chain = self.family_name_path(family_id)
         target_name = self.from_target_name(target_id)
         return f"{target_name}#" + ">".join(chain)
 
@@ -208,14 +659,16 @@ class IUPHARData:
     # Target ID mapping functions
     # ------------------------------------------------------------------
 
-    def _select_target_ids(self, mask: pd.Series) -> List[str]:
-        rows = self.target_df.loc[mask, "target_id"].dropna().astype(str)
-        return list(rows.unique())
+    def _indexed_target_ids(self, column: str, value: Any) -> List[str]:
+        try:
+            return self._target_ids[column].get(value, [])
+        except TypeError:  # unhashable lookup value
+            return []
 
     def target_id_by_uniprot(self, uniprot_id: str) -> str:
         """Return the first target ID mapped to ``uniprot_id``."""
 
-        ids = self._select_target_ids(self.target_df["uniprot_id"].eq(uniprot_id))
+        ids = self._indexed_target_ids("uniprot_id", uniprot_id)
         return ids[0] if ids else ""
 
     def target_id_by_hgnc_name(self, hgnc_name: str) -> str:
@@ -223,19 +676,19 @@ class IUPHARData:
 
         if not hgnc_name:
             return ""
-        ids = self._select_target_ids(self.target_df["hgnc_name"].eq(hgnc_name))
+        ids = self._indexed_target_ids("hgnc_name", hgnc_name)
         return "|".join(ids) if ids else ""
 
     def target_id_by_hgnc_id(self, hgnc_id: str) -> str:
         """Return target IDs whose HGNC identifier matches ``hgnc_id``."""
 
-        ids = self._select_target_ids(self.target_df["hgnc_id"].eq(hgnc_id))
+        ids = self._indexed_target_ids("hgnc_id", hgnc_id)
         return "|".join(ids) if ids else ""
 
     def target_id_by_gene(self, gene_name: str) -> str:
         """Return target IDs whose gene symbol matches ``gene_name``."""
 
-        ids = self._select_target_ids(self.target_df["gene_name"].eq(gene_name))
+        ids = self._indexed_target_ids("gene_name", gene_name)
         return "|".join(ids) if ids else ""
 
     def target_id_by_name(self, target_name: str) -> str:
@@ -257,19 +710,24 @@ class IUPHARData:
 
         if not target_name:
             return ""
-        mask = self.target_df["synonyms"].fillna("").str.contains(
-            target_name, case=False, na=False, regex=False
+        positions = self._synonym_index.find(target_name)
+        values = self._target_id_values
+        ids = dict.fromkeys(
+            str(values[pos]) for pos in positions if pd.notna(values[pos])
         )
-        ids = self._select_target_ids(mask)
         return "|".join(ids) if ids else ""
 
+    def target_ids_by_names(self, names: Iterable[str]) -> Dict[str, str]:
+        """Return :meth:`target_id_by_name` for each distinct name in ``names``."""
+
+        return {name: self.target_id_by_name(name) for name in dict.fromkeys(names)}
+
     def target_ids_by_synonyms(self, synonyms: Iterable[str]) -> str:
         """Return target IDs derived from a collection of ``synonyms``."""
 
         valid = [s for s in synonyms if s and len(s) > 3]
         ids: List[str] = []
-        for syn in valid:
-            mapped = self.target_id_by_name(syn)
+        for mapped in self.target_ids_by_names(valid).values():
             if mapped and "|" not in mapped:
                 ids.append(mapped)
         unique = sorted(set(ids))
@@ -321,17 +779,8 @@ class IUPHARData:
     ) -> pd.DataFrame:
         """Map UniProt IDs to classification data and write a CSV output.
 
-        The input CSV must contain a ``uniprot_id`` column. If the file
-        includes a ``GuidetoPHARMACOLOGY`` column, non-empty values are taken
-        as the target identifier. For rows lacking this cross-reference, the
-        function attempts to resolve the target via the UniProt accession. If
-        that fails, optional columns ``hgnc_name``, ``hgnc_id``, ``gene_name``
-        and ``synonyms`` (pipe-delimited) are consulted in that order.
-        Successful lookups are translated to a full IUPHAR classification. The
-        resulting table includes the target ID, class, subclass, and family
-        chain in addition to the full ID and name paths. If no target can be
-        resolved, an optional ``ec_number`` column is used to derive
-        ``IUPHAR_type``, ``IUPHAR_class`` and ``IUPHAR_subclass``.
+        Reads ``input_path`` as strings, classifies it with
+        :meth:`map_uniprot_df` and writes the result to ``output_path``.
 
         Parameters
         ----------
@@ -350,9 +799,53 @@ class IUPHARData:
             DataFrame containing the mapping results.
         """
 
-        df = pd.read_csv(input_path, dtype=str, encoding=encoding, sep=sep).fillna("")
+        df = pd.read_csv(input_path, dtype=str, encoding=encoding, sep=sep)
         if "uniprot_id" not in df.columns:
             raise ValueError("Input file must contain 'uniprot_id' column")
+        df = self.map_uniprot_df(df)
+        df.to_csv(output_path, index=False, encoding=encoding, sep=sep)
+        logger.info("Wrote %d rows to %s", len(df), output_path)
+        return df
+
+    def map_uniprot_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return ``df`` with IUPHAR target and classification columns added.
+
+        ``df`` must contain a ``uniprot_id`` column. If the frame
+        includes a ``GuidetoPHARMACOLOGY`` column, non-empty values are taken
+        as the target identifier. For rows lacking this cross-reference, the
+        function attempts to resolve the target via the UniProt accession. If
+        that fails, optional columns ``hgnc_name``, ``hgnc_id``, ``gene_name``
+        and ``synonyms`` (pipe-delimited) are consulted in that order.
+        Successful lookups are translated to a full IUPHAR classification. The
+        resulting table includes the target ID, class, subclass, and family
+        chain in addition to the full ID and name paths. If no target can be
+        resolved, an optional ``ec_number`` column is used to derive
+        ``IUPHAR_type``, ``IUPHAR_class`` and ``IUPHAR_subclass``.
+
+        Missing values are treated as empty strings; ``df`` itself is left
+        unchanged.
+
+        Parameters
+        ----------
+        df:
+            Table with a ``uniprot_id`` column and any of the optional
+            columns above.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A copy of ``df`` with the mapping results, aligned with its index.
+
+        Raises
+        ------
+        ValueError
+            If ``df`` has no ``uniprot_id`` column.
+        """
+
+        if "uniprot_id" not in df.columns:
+            raise ValueError("Input frame must contain 'uniprot_id' column")
+        # Categorical and boolean columns cannot take "" directly.
+        df = df.astype(object).where(df.notna(), "")
 
         classifier = IUPHARClassifier(self)
 
@@ -366,77 +859,71 @@ class IUPHARData:
 
         # Resolve remaining identifiers with a series of fallbacks. The search
         # order mirrors the Power Query logic: UniProt accession, HGNC name,
-        # HGNC ID, gene symbol and finally any supplied synonyms.
-        mask = df["target_id"].eq("")
-        df.loc[mask, "target_id"] = df.loc[mask, "uniprot_id"].apply(
-            self.target_id_by_uniprot
-        )
-
-        if "hgnc_name" in df.columns:
-            mask = df["target_id"].eq("")
-            df.loc[mask, "target_id"] = df.loc[mask, "hgnc_name"].apply(
-                self.target_id_by_hgnc_name
-            )
-
-        if "hgnc_id" in df.columns:
-            mask = df["target_id"].eq("")
-            df.loc[mask, "target_id"] = df.loc[mask, "hgnc_id"].apply(
-                self.target_id_by_hgnc_id
-            )
-
-        if "gene_name" in df.columns:
+        # HGNC ID, gene symbol and finally any supplied synonyms. Each stage
+        # maps the unresolved rows through a lookup table in one pass.
+        indexes = self._target_ids
+        lookups = [
+            ("uniprot_id", {k: ids[0] for k, ids in indexes.get("uniprot_id", {}).items()}),
+            # ``target_id_by_hgnc_name`` ignores empty names.
+            (
+                "hgnc_name",
+                {k: "|".join(ids) for k, ids in indexes.get("hgnc_name", {}).items() if k},
+            ),
+            ("hgnc_id", {k: "|".join(ids) for k, ids in indexes.get("hgnc_id", {}).items()}),
+            ("gene_name", {k: "|".join(ids) for k, ids in indexes.get("gene_name", {}).items()}),
+        ]
+        for column, table in lookups:
+            if column not in df.columns:
+                continue
             mask = df["target_id"].eq("")
-            df.loc[mask, "target_id"] = df.loc[mask, "gene_name"].apply(
-                self.target_id_by_gene
-            )
+            df.loc[mask, "target_id"] = df.loc[mask, column].map(table).fillna("")
 
         if "synonyms" in df.columns:
             mask = df["target_id"].eq("")
-            df.loc[mask, "target_id"] = df.loc[mask, "synonyms"].apply(
-                lambda s: self.target_ids_by_synonyms(str(s).split("|")) if s else ""
-            )
-
-        def _classify(row: pd.Series) -> pd.Series:
-            tid = row.get("target_id", "")
-            record: ClassificationRecord
-            if tid:
-                record = classifier.by_target_id(tid)
-            else:
-                ec = row.get("ec_number", "")
-                if ec:
-                    record = classifier.by_ec_number(ec)
-                else:
-                    mf = row.get("molecular_function", "")
-                    if mf:
-                        record = classifier.by_molecular_function(mf)
-                    else:
-                        return pd.Series(
-                            {
-                                "IUPHAR_family_id": "",
-                                "IUPHAR_type": "",
-                                "IUPHAR_class": "",
-                                "IUPHAR_subclass": "",
-                                "IUPHAR_chain": "",
-                            }
-                        )
-            return pd.Series(
-                {
-                    "IUPHAR_family_id": record.IUPHAR_family_id,
-                    "IUPHAR_type": record.IUPHAR_type,
-                    "IUPHAR_class": record.IUPHAR_class,
-                    "IUPHAR_subclass": record.IUPHAR_subclass,
-                    "IUPHAR_chain": ">".join(record.IUPHAR_tree),
-                }
-            )
-
-        class_df = df.apply(_classify, axis=1)
+            pending = df.loc[mask, "synonyms"]
+            table = {
+                s: self.target_ids_by_synonyms(str(s).split("|")) if s else ""
+                for s in pending.unique()
+            }
+            df.loc[mask, "target_id"] = pending.map(table)
+
+        # Each row is classified by its target, else its EC numbers, else its
+        # molecular function. Lower-priority inputs are blanked so a target
+        # ID matching several targets does not fall through to the EC
+        # numbers, and rows without any input are left empty.
+        empty = pd.Series("", index=df.index)
+        keys = pd.DataFrame(
+            {
+                "target_id": df["target_id"],
+                "ec_number": df["ec_number"] if "ec_number" in df.columns else empty,
+                "molecular_function": (
+                    df["molecular_function"] if "molecular_function" in df.columns else empty
+                ),
+            }
+        )
+        keys.loc[keys["target_id"].ne(""), ["ec_number", "molecular_function"]] = ""
+        keys.loc[keys["ec_number"].ne(""), "molecular_function"] = ""
+        columns = [
+            "IUPHAR_family_id",
+            "IUPHAR_type",
+            "IUPHAR_class",
+            "IUPHAR_subclass",
+            "IUPHAR_chain",
+        ]
+        class_df = classifier.classify_many(
+            keys["target_id"],
+            ec_numbers=keys["ec_number"],
+            functions=keys["molecular_function"],
+        )[columns]
+        class_df.loc[keys.eq("").all(axis=1)] = ""
         df = pd.concat([df, class_df], axis=1)
 
-        df["full_id_path"] = df["target_id"].apply(self.all_id)
-        df["full_name_path"] = df["target_id"].apply(self.all_name)
+        paths = pd.Series(df["target_id"].unique())
+        df["full_id_path"] = df["target_id"].map(dict(zip(paths, paths.map(self.all_id))))
+        df["full_name_path"] = df["target_id"].map(
+            dict(zip(paths, paths.map(self.all_name)))
+        )
 
-        df.to_csv(output_path, index=False, encoding=encoding, sep=sep)
-        logger.info("Wrote %d rows to %s", len(df), output_path)
         return df
 
     # ------------------------------------------------------------------
@@ -446,21 +933,14 @@ class IUPHARData:
     def from_target_record(self, target_id: str) -> Optional[pd.Series]:
         """Return the raw target record for ``target_id`` if present."""
 
-        rows = self.target_df[self.target_df["target_id"] == target_id]
-        if rows.empty:
-            return None
-        return rows.iloc[0]
+        pos = self._target_rows.get(target_id)
+        return None if pos is None else self.target_df.iloc[pos]
 
     def from_target_family_record(self, target_id: str) -> Optional[pd.Series]:
         """Return the family record associated with ``target_id``."""
 
-        mask = self.family_df["target_id"].fillna("").str.split("|").apply(
-            lambda ids: target_id in ids
-        )
-        rows = self.family_df[mask]
-        if rows.empty:
-            return None
-        return rows.iloc[0]
+        pos = self._family_rows_by_target.get(target_id)
+        return None if pos is None else self.family_df.iloc[pos]
 
     def from_target_name(self, target_id: str) -> str:
         """Return the IUPHAR target name for ``target_id``."""
@@ -489,11 +969,7 @@ class IUPHARData:
     def from_target_family_id(self, target_id: str) -> str:
         """Return the family identifier linked to ``target_id``."""
 
-        record = self.from_target_record(target_id)
-        if record is None:
-            return ""
-        value = record.get("family_id")
-        return str(value) if pd.notna(value) else ""
+        return self._target_families.get(target_id, "")
 
     def from_target_parent_family(self, target_id: str) -> str:
         """Return the parent family ID for ``target_id``."""
@@ -531,10 +1007,8 @@ class IUPHARData:
     def from_family_record(self, family_id: str) -> Optional[pd.Series]:
         """Return the raw family record for ``family_id`` if present."""
 
-        rows = self.family_df[self.family_df["family_id"] == family_id]
-        if rows.empty:
-            return None
-        return rows.iloc[0]
+        pos = self._family_rows.get(family_id)
+        return None if pos is None else self.family_df.iloc[pos]
 
     def from_family_parent(self, family_id: str) -> str:
         """Return the parent family identifier for ``family_id``."""
@@ -555,39 +1029,116 @@ class IUPHARData:
         Returns a dictionary with the first hit or an empty dict on failure.
         """
 
-        url = (
-            "https://www.guidetopharmacology.org/services/targets/?geneSymbol="
-            + gene_name
-        )
+        return _websearch_gene(gene_name) or {}
+
+    def websearch_genes(
+        self,
+        symbols: Iterable[str],
+        data_dir: str | Path = "data",
+        *,
+        max_workers: int = WEBSEARCH_MAX_WORKERS,
+        rate: float = 10.0,
+        session: Any = None,
+        timeout: float = 10.0,
+    ) -> Dict[str, dict]:
+        """Query the IUPHAR web API for many gene symbols.
+
+        Results are remembered in ``<data_dir>/websearch_genes.json``,
+        including symbols without a hit, so each symbol is searched once
+        across runs. Uncached symbols are searched concurrently over the
+        shared session.
+
+        Parameters
+        ----------
+        symbols:
+            Gene symbols to search. Empty and duplicate symbols are skipped.
+        data_dir:
+            Directory holding the result cache.
+        max_workers:
+            Maximum number of concurrent requests.
+        rate:
+            Maximum number of requests started per second; ``0`` disables
+            the limit.
+        session:
+            Optional :class:`requests.Session` used instead of the shared one.
+        timeout:
+            Request timeout in seconds.
+
+        Returns
+        -------
+        dict
+            Mapping of symbol to its first hit, or an empty dictionary when
+            the symbol has no target. Symbols whose request failed are
+            absent and searched again on the next call.
+        """
+
+        wanted = list(dict.fromkeys(s for s in symbols if s))
+        cache_path = Path(data_dir) / WEBSEARCH_CACHE_FILE
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            return data[0] if data else {}
-        except requests.RequestException as exc:  # pragma: no cover - network errors
-            logger.error("IUPHAR web request failed: %s", exc)
-            return {}
+            with open(cache_path, "rb") as handle:
+                cached: Dict[str, dict] = _jl.load(handle)
+        except FileNotFoundError:
+            cached = {}
+        except (OSError, ValueError) as exc:
+            logger.warning("ignoring unreadable web search cache %s: %s", cache_path, exc)
+            cached = {}
+        missing = [s for s in wanted if s not in cached]
+
+        if missing:
+            limiter = _RateLimiter(rate)
+
+            def search(symbol: str) -> Optional[Dict[str, Any]]:
+                limiter.wait()
+                return _websearch_gene(symbol, session, timeout)
+
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                results = dict(zip(missing, pool.map(search, missing)))
+            found = {s: hit for s, hit in results.items() if hit is not None}
+            logger.info(
+                "searched %d gene symbols: %d hits, %d without target, %d failed",
+                len(missing),
+                sum(1 for hit in found.values() if hit),
+                sum(1 for hit in found.values() if not hit),
+                len(missing) - len(found),
+            )
+            if found:
+                cached.update(found)
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    _write_bytes_atomic(cache_path, json.dumps(cached).encode())
+                except OSError as exc:
+                    logger.warning("unable to write web search cache %s: %s", cache_path, exc)
+        return {s: cached[s] for s in wanted if s in cached}
 
     # ------------------------------------------------------------------
     # IUPHAR upload processing
     # ------------------------------------------------------------------
 
-    def iuphar_upload(self) -> pd.DataFrame:
+    def iuphar_upload(
+        self,
+        data_dir: str | Path = "data",
+        *,
+        offline: bool = False,
+        session: Any = None,
+        timeout: float = 30.0,
+    ) -> pd.DataFrame:
         """Reproduce the ``IUPHAR_upload`` transformation.
 
-        The function downloads mapping files from the IUPHAR service and
-        combines them with the local target and family tables.
+        The function combines the IUPHAR UniProt and HGNC mapping files with
+        the local target and family tables. The mapping files are mirrored in
+        ``data_dir`` and only downloaded again when the server reports a
+        change; see :func:`mirror_mapping_file` for the remaining arguments.
         """
 
-        uni_url = (
-            "https://www.guidetopharmacology.org/DATA/GtP_to_UniProt_mapping.csv"
-        )
-        hgnc_url = (
-            "https://www.guidetopharmacology.org/DATA/GtP_to_HGNC_mapping.csv"
-        )
-
-        uni_df = pd.read_csv(uni_url)
-        hgnc_df = pd.read_csv(hgnc_url)
+        uni_path, hgnc_path = [
+            mirror_mapping_file(
+                name, data_dir, offline=offline, session=session, timeout=timeout
+            )
+            for name in (IUPHAR_UNIPROT_MAPPING, IUPHAR_HGNC_MAPPING)
+        ]
+        # Identifiers are read as strings to match the local tables.
+        uni_df = pd.read_csv(uni_path, dtype=str)
+        hgnc_df = pd.read_csv(hgnc_path, dtype=str)
         hgnc_df = hgnc_df.rename(columns={"IUPHAR ID": "GtoPdb IUPHAR ID"})
         mapping = pd.merge(
             hgnc_df,
@@ -626,40 +1177,169 @@ class IUPHARData:
         return result
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClassificationRecord:
-    """Represents a classification result derived from IUPHAR data."""
+    """Represents a classification result derived from IUPHAR data.
+
+    Records are immutable so the classifier can hand the same instance to
+    every row sharing an input. List arguments are stored as tuples.
+    """
 
     IUPHAR_target_id: str = "N/A"
     IUPHAR_family_id: str = "N/A"
     IUPHAR_class: str = "Other Protein Target"
     IUPHAR_subclass: str = "Other Protein Target"
-    IUPHAR_tree: List[str] = None  # set in __post_init__
+    IUPHAR_tree: Tuple[str, ...] = ("0864-1", "0864")
     IUPHAR_type: str = "Other Protein Target.Other Protein Target"
     IUPHAR_name: str = "N/A"
-    IUPHAR_ecNumber: List[str] = None
+    IUPHAR_ecNumber: Tuple[str, ...] = ()
     STATUS: str = "N/A"
 
     def __post_init__(self) -> None:
-        if self.IUPHAR_tree is None:
-            self.IUPHAR_tree = ["0864-1", "0864"]
-        if self.IUPHAR_ecNumber is None:
-            self.IUPHAR_ecNumber = []
+        for name in ("IUPHAR_tree", "IUPHAR_ecNumber"):
+            value = getattr(self, name)
+            if not isinstance(value, tuple):
+                object.__setattr__(self, name, tuple(value or ()))
+
+
+def _group_mode(keys: pd.Series, values: pd.Series) -> Dict[Any, Any]:
+    """Return the most frequent non-null value of ``values`` per key.
+
+    Ties go to the smallest value, as with :meth:`pandas.Series.mode`. Keys
+    without a non-null value are absent.
+    """
+
+    pairs = pd.DataFrame({"key": keys, "value": values}).dropna()
+    counts = pairs.groupby(["key", "value"]).size().reset_index(name="count")
+    # Values are sorted within each key, so a stable sort on the count keeps
+    # the smallest of the most frequent values first.
+    best = counts.sort_values("count", ascending=False, kind="stable").drop_duplicates("key")
+    return dict(zip(best["key"], best["value"]))
+
+
+# Columns returned by :meth:`IUPHARClassifier.classify_many`.
+CLASSIFICATION_COLUMNS: tuple[str, ...] = (
+    "IUPHAR_target_id",
+    "IUPHAR_family_id",
+    "IUPHAR_type",
+    "IUPHAR_class",
+    "IUPHAR_subclass",
+    "IUPHAR_chain",
+    "IUPHAR_name",
+    "IUPHAR_ecNumber",
+    "STATUS",
+)
+
+# ``STATUS`` values that count as a successful result for each stage.
+_STAGE_STATUSES: Dict[str, frozenset[str]] = {
+    "target_id": frozenset({"target_id", "family_id"}),
+    "family_id": frozenset({"family_id"}),
+    "ec_number": frozenset({"ec_number"}),
+    "name": frozenset({"name"}),
+    "molecular_function": frozenset({"molecular_function"}),
+}
+
+
+@dataclass(slots=True)
+class StageStats:
+    """Usage of one :class:`IUPHARClassifier` resolution stage."""
+
+    calls: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+
+# Upper bound on the entries kept per memoised classifier method.
+_CLASSIFIER_CACHE_SIZE = 1 << 16
+
+
+def _memoised(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Memoise ``method`` per classifier instance in a bounded LRU cache.
+
+    Results are keyed by the call arguments; list arguments are frozen to
+    tuples so they can be hashed.
+    """
+
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self: "IUPHARClassifier", *args: Any, **kwargs: Any) -> Any:
+        cache = self._caches.get(name)
+        if cache is None:
+            cache = functools.lru_cache(maxsize=self.cache_size)(
+                functools.partial(method, self)
+            )
+            self._caches[name] = cache
+        args = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+        kwargs = {k: tuple(v) if isinstance(v, list) else v for k, v in kwargs.items()}
+        return cache(*args, **kwargs)
+
+    return wrapper
 
 
 class IUPHARClassifier:
-    """Utility class replicating Power Query classification logic."""
+    """Utility class replicating Power Query classification logic.
 
-    def __init__(self, data: IUPHARData):
+    ``by_target_id``, ``by_ec_number``, ``set_record`` and
+    ``_target_to_type`` are memoised per instance, keeping at most
+    ``cache_size`` results each. Call :meth:`clear_cache` after modifying
+    the underlying :class:`IUPHARData`.
+    """
+
+    def __init__(self, data: IUPHARData, cache_size: int = _CLASSIFIER_CACHE_SIZE):
         self.data = data
+        self.cache_size = cache_size
+        self._caches: Dict[str, Any] = {}
+        self._stage_stats: Dict[str, StageStats] = {}
+
+    def _run_stage(
+        self, stage: str, resolve: Callable[..., ClassificationRecord], *args: str
+    ) -> Optional[ClassificationRecord]:
+        """Run one resolution stage and return its record if it succeeded."""
+
+        start = time.perf_counter()
+        record = resolve(*args)
+        stats = self._stage_stats.setdefault(stage, StageStats())
+        stats.calls += 1
+        stats.seconds += time.perf_counter() - start
+        if record.STATUS in _STAGE_STATUSES[stage]:
+            stats.hits += 1
+            return record
+        return None
+
+    def stage_stats(self) -> Dict[str, StageStats]:
+        """Return call counts, hit counts and timings per resolution stage.
+
+        Stages are keyed by the ``STATUS`` they produce. :meth:`get` counts
+        every call; :meth:`classify_many` counts every distinct key.
+        """
+
+        return {stage: replace(stats) for stage, stats in self._stage_stats.items()}
+
+    def reset_stage_stats(self) -> None:
+        """Reset the statistics reported by :meth:`stage_stats`."""
+
+        self._stage_stats.clear()
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Return ``functools`` cache statistics for each memoised method."""
+
+        return {name: cache.cache_info() for name, cache in self._caches.items()}
+
+    def clear_cache(self) -> None:
+        """Discard all memoised classification results."""
+
+        self._caches.clear()
 
     # ------------------------------------------------------------------
     # Validation helpers
     # ------------------------------------------------------------------
 
+    _INVALID_PARAMETERS = frozenset({"N/A", "Other Protein Target"})
+
     @staticmethod
     def _is_valid_parameter(parameter: Optional[str]) -> bool:
-        return bool(parameter) and parameter not in {"N/A", "Other Protein Target"}
+        return bool(parameter) and parameter not in IUPHARClassifier._INVALID_PARAMETERS
 
     @staticmethod
     def _is_valid_list(values: Iterable[str]) -> bool:
@@ -679,10 +1359,10 @@ class IUPHARClassifier:
             return self.data.from_family_type(family_id) or "N/A"
         return "N/A"
 
-    def _family_to_chain(self, family_id: str) -> List[str]:
+    def _family_to_chain(self, family_id: str) -> Tuple[str, ...]:
         if self._is_valid_parameter(family_id):
-            return self.data.family_chain(family_id)
-        return []
+            return tuple(self.data.family_chain(family_id))
+        return ()
 
     def _target_record(self, target_id: str) -> Optional[pd.Series]:
         if self._is_valid_parameter(target_id):
@@ -693,6 +1373,7 @@ class IUPHARClassifier:
     # Type helpers
     # ------------------------------------------------------------------
 
+    @_memoised
     def _target_to_type(self, target_id: str) -> str:
         record = self._target_record(target_id)
         if record is None:
@@ -741,27 +1422,27 @@ class IUPHARClassifier:
 
     # Mapping for EC-number derived types to classification chain
     _CHAIN_MAP = {
-        "Enzyme.Oxidoreductase": ["0690-1", "0690"],
-        "Enzyme.Transferase": ["0690-2", "0690"],
-        "Enzyme.Multifunctional": ["0690-3", "0690"],
-        "Enzyme.Hydrolase": ["0690-4", "0690"],
-        "Enzyme.Isomerase": ["0690-5", "0690"],
-        "Enzyme.Lyase": ["0690-6", "0690"],
-        "Enzyme.Ligase": ["0690-6", "0690"],
-        "Receptor.Catalytic receptor": ["0862", "0688"],
-        "Receptor.G protein-coupled receptor": ["0694", "0688"],
-        "Receptor.Nuclear hormone receptor": ["0095", "0688"],
-        "Transporter.ATP-binding cassette transporter family": ["0136", "0691"],
-        "Transporter.F-type and V-type ATPase": ["0137", "0691"],
-        "Transporter.P-type ATPase": ["0138", "0691"],
-        "Transporter.SLC superfamily of solute carrier": ["0863", "0691"],
-        "Ion channel.Ligand-gated ion channel": ["0697", "0689"],
-        "Ion channel.Other ion channel": ["0861", "0689"],
-        "Ion channel.Voltage-gated ion channel": ["0696", "0689"],
+        "Enzyme.Oxidoreductase": ("0690-1", "0690"),
+        "Enzyme.Transferase": ("0690-2", "0690"),
+        "Enzyme.Multifunctional": ("0690-3", "0690"),
+        "Enzyme.Hydrolase": ("0690-4", "0690"),
+        "Enzyme.Isomerase": ("0690-5", "0690"),
+        "Enzyme.Lyase": ("0690-6", "0690"),
+        "Enzyme.Ligase": ("0690-6", "0690"),
+        "Receptor.Catalytic receptor": ("0862", "0688"),
+        "Receptor.G protein-coupled receptor": ("0694", "0688"),
+        "Receptor.Nuclear hormone receptor": ("0095", "0688"),
+        "Transporter.ATP-binding cassette transporter family": ("0136", "0691"),
+        "Transporter.F-type and V-type ATPase": ("0137", "0691"),
+        "Transporter.P-type ATPase": ("0138", "0691"),
+        "Transporter.SLC superfamily of solute carrier": ("0863", "0691"),
+        "Ion channel.Ligand-gated ion channel": ("0697", "0689"),
+        "Ion channel.Other ion channel": ("0861", "0689"),
+        "Ion channel.Voltage-gated ion channel": ("0696", "0689"),
     }
 
     @staticmethod
-    def _ec_number_to_type(ec_numbers: List[str]) -> str:
+    def _ec_number_to_type(ec_numbers: Iterable[str]) -> str:
         if not IUPHARClassifier._is_valid_list(ec_numbers):
             return ""
         prefixes = {
@@ -783,22 +1464,27 @@ class IUPHARClassifier:
         }
         return mapping.get(code, "")
 
+    @staticmethod
+    def _split_ec_numbers(value: str) -> List[str]:
+        return value.split("|") if "." in value or "|" in value else []
+
     @classmethod
-    def _ec_number_to_chain(cls, ec_numbers: List[str]) -> List[str]:
+    def _ec_number_to_chain(cls, ec_numbers: Iterable[str]) -> Tuple[str, ...]:
         target_type = cls._ec_number_to_type(ec_numbers)
-        return cls._CHAIN_MAP.get(target_type, ["0864-1", "0864"])
+        return cls._CHAIN_MAP.get(target_type, ("0864-1", "0864"))
 
     # ------------------------------------------------------------------
     # Public classification methods
     # ------------------------------------------------------------------
 
+    @_memoised
     def set_record(
         self,
         iuphar_target_id: str,
         iuphar_family_id: str,
         iuphar_name: str,
         status: Optional[str] = None,
-        ec_numbers: Optional[List[str]] = None,
+        ec_numbers: Optional[Iterable[str]] = None,
     ) -> ClassificationRecord:
         target_id = (
             iuphar_target_id if self._is_valid_parameter(iuphar_target_id) else "N/A"
@@ -832,7 +1518,7 @@ class IUPHARClassifier:
         tree = (
             self._family_to_chain(family_id)
             if self._is_valid_parameter(family_id)
-            else ["0864-1", "0864"]
+            else ("0864-1", "0864")
         )
 
         return ClassificationRecord(
@@ -847,6 +1533,7 @@ class IUPHARClassifier:
             STATUS=status,
         )
 
+    @_memoised
     def by_target_id(
         self, iuphar_target_id: str, optional_name: Optional[str] = None
     ) -> ClassificationRecord:
@@ -879,16 +1566,13 @@ class IUPHARClassifier:
             return ClassificationRecord()
         return self.set_record("N/A", iuphar_family_id, optional_name or "")
 
+    @_memoised
     def by_ec_number(
         self, iuphar_ec_number: str, optional_name: Optional[str] = None
     ) -> ClassificationRecord:
         """Classify based on an EC number string."""
 
-        numbers = (
-            iuphar_ec_number.split("|")
-            if "." in iuphar_ec_number or "|" in iuphar_ec_number
-            else []
-        )
+        numbers = self._split_ec_numbers(iuphar_ec_number)
         if not self._is_valid_list(numbers):
             return ClassificationRecord()
         type_val = self._ec_number_to_type(numbers) or "Other Protein Target.Other Protein Target"
@@ -934,7 +1618,7 @@ class IUPHARClassifier:
         parts = type_val.split(".")
         cls_part = parts[0] if parts else "Other Protein Target"
         sub_part = parts[1] if len(parts) > 1 else "Other Protein Target"
-        tree = self._CHAIN_MAP.get(type_val, ["0864-1", "0864"])
+        tree = self._CHAIN_MAP.get(type_val, ("0864-1", "0864"))
         return ClassificationRecord(
             IUPHAR_type=type_val,
             IUPHAR_class=cls_part,
@@ -960,7 +1644,7 @@ class IUPHARClassifier:
         tree = (
             self._family_to_chain(family_id)
             if self._is_valid_parameter(family_id)
-            else ["864-1", "864"]
+            else ("864-1", "864")
         )
         parts = type_val.split(".")
         cls_part = parts[0] if parts else "Other Protein Target"
@@ -983,30 +1667,149 @@ class IUPHARClassifier:
         iuphar_ec_number: str,
         iuphar_name: str,
     ) -> ClassificationRecord:
-        """Resolve the best classification given multiple identifiers."""
+        """Resolve the best classification given multiple identifiers.
 
-        target_rec = (
-            self.by_target_id(iuphar_target_id, iuphar_name)
-            if self._is_valid_parameter(iuphar_target_id)
-            else ClassificationRecord()
-        )
-        family_rec = (
-            self.by_family_id(iuphar_family_id, iuphar_name)
-            if self._is_valid_parameter(iuphar_family_id)
-            else ClassificationRecord()
+        Stages are tried in the order target ID, family ID, EC numbers and
+        name; later stages only run when the earlier ones fail. Hit counts
+        and timings are available from :meth:`stage_stats`.
+        """
+
+        stages: Tuple[Tuple[str, Callable[..., ClassificationRecord], Tuple[str, ...]], ...] = (
+            ("target_id", self.by_target_id, (iuphar_target_id, iuphar_name)),
+            ("family_id", self.by_family_id, (iuphar_family_id, iuphar_name)),
+            ("ec_number", self.by_ec_number, (iuphar_ec_number, iuphar_name)),
+            ("name", self.by_name, (iuphar_name,)),
         )
-        ec_rec = self.by_ec_number(iuphar_ec_number, iuphar_name)
-        name_rec = self.by_name(iuphar_name)
-        if target_rec.STATUS in {"target_id", "family_id"}:
-            return target_rec
-        if family_rec.STATUS == "family_id":
-            return family_rec
-        if ec_rec.STATUS == "ec_number":
-            return ec_rec
-        if name_rec.STATUS == "name":
-            return name_rec
+        for stage, resolve, args in stages:
+            # Every stage returns the default record for an invalid input.
+            if not self._is_valid_parameter(args[0]):
+                continue
+            record = self._run_stage(stage, resolve, *args)
+            if record is not None:
+                return record
         return ClassificationRecord()
 
+    def classify_many(
+        self,
+        target_ids: Iterable[str],
+        family_ids: Optional[Iterable[str]] = None,
+        ec_numbers: Optional[Iterable[str]] = None,
+        names: Optional[Iterable[str]] = None,
+        functions: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """Classify many inputs at once with the precedence of :meth:`get`.
+
+        Each row is resolved by its target ID, else its family ID, else its
+        EC numbers, else its name and finally its molecular function (see
+        :meth:`by_molecular_function`). Rows are grouped by the stage that
+        resolves them and each distinct key is classified only once.
+
+        Parameters
+        ----------
+        target_ids:
+            IUPHAR target identifiers. The index of a :class:`pandas.Series`
+            is kept for the result.
+        family_ids, ec_numbers, names, functions:
+            Optional inputs aligned with ``target_ids``; missing ones are
+            treated as empty.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per input with the :data:`CLASSIFICATION_COLUMNS`.
+            ``IUPHAR_chain`` and ``IUPHAR_ecNumber`` are joined with ``>``
+            and ``|`` respectively.
+        """
+
+        target = pd.Series(target_ids, dtype=object)
+        index = target.index
+
+        def column(values: Optional[Iterable[str]]) -> pd.Series:
+            if values is None:
+                return pd.Series("", index=index, dtype=object)
+            return pd.Series(list(values), index=index, dtype=object)
+
+        keys = pd.DataFrame(
+            {
+                "target_id": target,
+                "family_id": column(family_ids),
+                "ec_number": column(ec_numbers),
+                "name": column(names),
+                "function": column(functions),
+            }
+        ).fillna("").astype(str)
+
+        def valid(col: str) -> pd.Series:
+            return keys[col].ne("") & ~keys[col].isin(self._INVALID_PARAMETERS)
+
+        def single(col: str) -> pd.Series:
+            return valid(col) & ~keys[col].str.contains("|", regex=False)
+
+        ec_valid = {
+            ec: self._is_valid_list(self._split_ec_numbers(ec))
+            for ec in keys["ec_number"].unique()
+        }
+        stages = [
+            ("target_id", single("target_id")),
+            ("family_id", single("family_id")),
+            ("ec_number", keys["ec_number"].map(ec_valid).astype(bool)),
+            ("name", valid("name")),
+            ("molecular_function", valid("function")),
+        ]
+        stage = pd.Series("", index=index, dtype=object)
+        for name, mask in reversed(stages):
+            stage = stage.mask(mask, name)
+
+        # Blank the inputs a stage does not read so rows sharing a key
+        # collapse onto one classification.
+        keys.loc[stage.ne("target_id"), "target_id"] = ""
+        keys.loc[stage.ne("family_id"), "family_id"] = ""
+        keys.loc[stage.ne("ec_number"), "ec_number"] = ""
+        keys.loc[stage.ne("molecular_function"), "function"] = ""
+        keys.loc[stage.isin(["", "molecular_function"]), "name"] = ""
+        keys["stage"] = stage
+
+        resolvers: Dict[str, Tuple[Callable[..., ClassificationRecord], Tuple[str, ...]]] = {
+            "target_id": (self.by_target_id, ("target_id", "name")),
+            "family_id": (self.by_family_id, ("family_id", "name")),
+            "ec_number": (self.by_ec_number, ("ec_number", "name")),
+            "name": (self.by_name, ("name",)),
+            "molecular_function": (self.by_molecular_function, ("function",)),
+        }
+        unique = keys.drop_duplicates().reset_index(drop=True)
+        values = []
+        for key in unique.itertuples(index=False):
+            record = None
+            if key.stage:
+                resolve, fields = resolvers[key.stage]
+                args = [getattr(key, name) for name in fields]
+                record = self._run_stage(key.stage, resolve, *args)
+            record = record or ClassificationRecord()
+            values.append(
+                (
+                    record.IUPHAR_target_id,
+                    record.IUPHAR_family_id,
+                    record.IUPHAR_type,
+                    record.IUPHAR_class,
+                    record.IUPHAR_subclass,
+                    ">".join(record.IUPHAR_tree),
+                    record.IUPHAR_name,
+                    "|".join(record.IUPHAR_ecNumber),
+                    record.STATUS,
+                )
+            )
+        columns = list(CLASSIFICATION_COLUMNS)
+        unique[columns] = pd.DataFrame(values, columns=columns, dtype=object)
+        result = keys.merge(unique, how="left", on=list(keys.columns))[columns]
+        result.index = index
+        logger.debug(
+            "classified %d rows from %d distinct inputs; stages: %s",
+            len(result),
+            len(unique),
+            self.stage_stats(),
+        )
+        return result
+
     # ------------------------------------------------------------------
     # Activity and initialisation helpers
     # ------------------------------------------------------------------
@@ -1044,26 +1847,31 @@ class IUPHARClassifier:
 
         df = self.merge_activity(input_df, activity_df)
 
-        def classify(row: pd.Series) -> pd.Series:
-            record = self.get(
-                row.get("guidetopharmacology_id", ""),
-                row.get("guidetopharmacology_family", ""),
-                row.get("ec_number", ""),
-                row.get("chembl_component_description", ""),
-            )
-            return pd.Series(
-                {
-                    "guidetopharmacology_id": record.IUPHAR_target_id,
-                    "guidetopharmacology_family": record.IUPHAR_family_id,
-                    "IUPHAR_type": record.IUPHAR_type,
-                    "IUPHAR_class": record.IUPHAR_class,
-                    "IUPHAR_subclass": record.IUPHAR_subclass,
-                    "IUPHAR_chain": ">".join(record.IUPHAR_tree),
-                    "IUPHAR_name": record.IUPHAR_name,
-                }
-            )
+        def column(name: str) -> Any:
+            return df[name] if name in df.columns else None
 
-        classified = df.apply(classify, axis=1)
+        result = self.classify_many(
+            df.get("guidetopharmacology_id", pd.Series("", index=df.index)),
+            column("guidetopharmacology_family"),
+            column("ec_number"),
+            column("chembl_component_description"),
+        )
+        classified = result[
+            [
+                "IUPHAR_target_id",
+                "IUPHAR_family_id",
+                "IUPHAR_type",
+                "IUPHAR_class",
+                "IUPHAR_subclass",
+                "IUPHAR_chain",
+                "IUPHAR_name",
+            ]
+        ].rename(
+            columns={
+                "IUPHAR_target_id": "guidetopharmacology_id",
+                "IUPHAR_family_id": "guidetopharmacology_family",
+            }
+        )
         return pd.concat([df, classified], axis=1)
 
     def by_reference(
@@ -1100,22 +1908,20 @@ class IUPHARClassifier:
 
         valid = family_table[family_table[db_column].notna() & (family_table[db_column] != "N/A")]
         merged = valid.merge(name_table, on="task_uniprot_id", how="left")
-        records = []
-        for key, group in merged.groupby(db_column):
-            family = (
-                group["guidetopharmacology_family"].dropna().mode().iloc[0]
-                if not group["guidetopharmacology_family"].dropna().empty
-                else ""
-            )
-            type_series = group["guidetopharmacology_id"].dropna().apply(
-                self.data.from_target_type
-            )
-            type_val = type_series.mode().iloc[0] if not type_series.empty else ""
-            records.append(
-                {
-                    db_column: key,
-                    "guidetopharmacology_family": family,
-                    "guidetopharmacology_type": type_val,
-                }
-            )
-        return pd.DataFrame(records)
\ No newline at end of file
+        keys = merged[db_column]
+        target_ids = merged["guidetopharmacology_id"]
+        # Each distinct target is typed once instead of once per row.
+        types = target_ids.map(
+            {tid: self.data.from_target_type(tid) for tid in target_ids.dropna().unique()}
+        )
+        family = _group_mode(keys, merged["guidetopharmacology_family"])
+        type_val = _group_mode(keys, types)
+        groups = merged.groupby(db_column).size().index
+        return pd.DataFrame(
+            {
+                db_column: list(groups),
+                "guidetopharmacology_family": [family.get(k, "") for k in groups],
+                "guidetopharmacology_type": [type_val.get(k, "") for k in groups],
+            },
+            columns=[db_column, "guidetopharmacology_family", "guidetopharmacology_type"],
+        )
\ No newline at end of file
@@ -16,6 +16,8 @@ from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from . import json_library as _jl
+
 
 logger = logging.getLogger(__name__)
 
@@ -159,7 +161,7 @@ def make_request(url: str, delay: float = 3.0) -> Optional[Dict[str, Any]]:
             return None
         response.raise_for_status()
         try:
-            return response.json()
+            return _jl.response_json(response)
         except ValueError:
             logger.warning("Non-JSON response for url %s", url)
             return None
@@ -12,6 +12,11 @@ import requests
 from xml.etree import ElementTree as ET
 from urllib.parse import quote
 
+try:
+    from . import json_library as _jl
+except ImportError:  # executed as a script
+    import json_library as _jl
+
 ENCODINGS = ["utf-8-sig", "cp1251", "latin1"]
 TIMEOUT = 10
 
@@ -88,7 +93,7 @@ def _do_request(
 
         if expect_json:
             try:
-                return resp.json(), ""
+                return _jl.response_json(resp), ""
             except ValueError as exc:
                 return None, f"Invalid JSON: {exc}"
         return resp.text, ""
@@ -6,10 +6,13 @@ merged target information produced by :mod:`get_target_data`.
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 import logging
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -41,6 +44,57 @@ def _pipe_merge(values: Iterable[str | float | None]) -> str:
     return "|".join(tokens)
 
 
+def _pipe_merge_columns(df: pd.DataFrame, columns: Iterable[str]) -> pd.Series:
+    """Vectorised :func:`_pipe_merge` over ``columns`` of every row.
+
+    The pipe-delimited values are exploded to one token per line, stripped
+    and deduplicated per row before being joined again, so the result
+    matches ``df.apply(lambda r: _pipe_merge([r.get(c) for c in columns]))``
+    without iterating over rows in Python.
+
+    Parameters
+    ----------
+    df:
+        Source table. Missing columns are ignored.
+    columns:
+        Columns to merge, in order of precedence.
+
+    Returns
+    -------
+    pandas.Series
+        Merged tokens aligned with ``df``; empty for rows without tokens.
+    """
+
+    merged = np.full(len(df), "", dtype=object)
+    present = [col for col in columns if col in df.columns]
+    if not present or df.empty:
+        return pd.Series(merged, index=df.index)
+    # Ravelling the selected columns row by row lists every row's values in
+    # column order, which is the order tokens are kept in.
+    cells = df[present].to_numpy(dtype=object).ravel()
+    rows = np.repeat(np.arange(len(df)), len(present))
+    keep = np.fromiter(
+        (isinstance(v, str) and v != "" for v in cells), bool, len(cells)
+    )
+    cells, rows = cells[keep], rows[keep]
+    # Splitting the concatenated values once yields every token in order;
+    # each value contributes one more token than it has pipes.
+    counts = np.fromiter((v.count("|") for v in cells), np.int64, len(cells)) + 1
+    tokens = np.array([t.strip() for t in "|".join(cells).split("|")], dtype=object)
+    rows = np.repeat(rows, counts)
+    keep = tokens != ""
+    long = pd.DataFrame({"row": rows[keep], "token": tokens[keep]}).drop_duplicates()
+    if long.empty:
+        return pd.Series(merged, index=df.index)
+    # Each row's tokens form one run that is concatenated in a single
+    # reduction instead of a per-row join.
+    rows = long["row"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    joined = np.add.reduceat((long["token"] + "|").to_numpy(dtype=object), starts)
+    merged[rows[starts]] = [value[:-1] for value in joined]
+    return pd.Series(merged, index=df.index)
+
+
 def _first_token(value: str | float | None) -> str:
     """Return the first token from a pipe-delimited string."""
 
@@ -94,9 +148,7 @@ def postprocess_targets(df: pd.DataFrame) -> pd.DataFrame:
     df.loc[mask, "gene_name"] = df.loc[mask, "gene"].apply(_first_token)
     df["gene_name"] = df["gene_name"].replace("", "-").str.upper()
 
-    df["gene"] = df.apply(
-        lambda r: _pipe_merge([r.get("gene"), r.get("gene_name")]), axis=1
-    )
+    df["gene"] = _pipe_merge_columns(df, ["gene", "gene_name"])
     df["gene"] = df["gene"].replace("", "-").str.upper()
 
     # --- synonyms --------------------------------------------------------------
@@ -111,9 +163,7 @@ def postprocess_targets(df: pd.DataFrame) -> pd.DataFrame:
         "synonyms_x",
         "synonyms",
     ]
-    df["synonyms"] = df.apply(
-        lambda r: _pipe_merge([r.get(f) for f in synonym_fields]), axis=1
-    )
+    df["synonyms"] = _pipe_merge_columns(df, synonym_fields)
     df["synonyms"] = (
         df["synonyms"]
         .str.replace("||", "|", regex=False)
@@ -123,9 +173,7 @@ def postprocess_targets(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     # --- EC numbers ------------------------------------------------------------
-    df["ec_number"] = df.apply(
-        lambda r: _pipe_merge([r.get("ec_number"), r.get("ec_code")]), axis=1
-    )
+    df["ec_number"] = _pipe_merge_columns(df, ["ec_number", "ec_code"])
     df["ec_number"] = df["ec_number"].replace("", "-")
 
     # --- fill optional columns --------------------------------------------------
@@ -143,7 +191,7 @@ def postprocess_targets(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = "-"
 
     # --- deduplicate gene field -------------------------------------------------
-    df["gene"] = df["gene"].apply(lambda v: _pipe_merge([v]))
+    df["gene"] = _pipe_merge_columns(df, ["gene"])
 
     # --- final column ordering --------------------------------------------------
     columns = [
@@ -202,12 +250,37 @@ def postprocess_targets(df: pd.DataFrame) -> pd.DataFrame:
     return df[columns]
 
 
+def _iter_processed(
+    chunks: Iterable[pd.DataFrame], workers: int
+) -> Iterator[pd.DataFrame]:
+    """Yield :func:`postprocess_targets` of each chunk in input order.
+
+    With several workers chunks are processed in a process pool; at most
+    ``2 * workers`` chunks are in flight so memory stays bounded.
+    """
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield postprocess_targets(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[pd.DataFrame]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(postprocess_targets, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def postprocess_file(
     input_path: Path | str,
     output_path: Path | str,
     *,
     sep: str = ",",
     encoding: str = "utf8",
+    chunksize: int | None = None,
+    workers: int = 1,
 ) -> None:
     """Read a CSV, post-process and write the result.
 
@@ -221,8 +294,36 @@ def postprocess_file(
         Field delimiter of the CSV files.
     encoding:
         Text encoding of the CSV files.
+    chunksize:
+        Process the file in chunks of this many rows, appending each to the
+        output, so memory use does not grow with the file. The output is
+        identical to processing the whole file because every
+        transformation is row-local.
+    workers:
+        Number of processes transforming chunks in parallel when
+        ``chunksize`` is set. Chunks are written in input order.
     """
 
-    df = pd.read_csv(input_path, sep=sep, encoding=encoding, dtype=str)
-    processed = postprocess_targets(df)
-    processed.to_csv(output_path, index=False, sep=sep, encoding=encoding)
\ No newline at end of file
+    if not chunksize:
+        df = pd.read_csv(input_path, sep=sep, encoding=encoding, dtype=str)
+        processed = postprocess_targets(df)
+        processed.to_csv(output_path, index=False, sep=sep, encoding=encoding)
+        return
+
+    chunks = pd.read_csv(
+        input_path, sep=sep, encoding=encoding, dtype=str, chunksize=chunksize
+    )
+    rows = 0
+    header = True
+    with chunks, open(output_path, "w", encoding=encoding, newline="") as handle:
+        for processed in _iter_processed(chunks, workers):
+            processed.to_csv(handle, index=False, sep=sep, header=header)
+            header = False
+            rows += len(processed)
+        if header:
+            # Keep the header of an empty table.
+            empty = pd.read_csv(
+                input_path, sep=sep, encoding=encoding, dtype=str, nrows=0
+            )
+            postprocess_targets(empty).to_csv(handle, index=False, sep=sep)
+    logger.info("post-processed %d rows into %s", rows, output_path)
@@ -19,6 +19,10 @@ The most commonly used functions are:
     Extract genus, superkingdom, phylum and taxon ID information from a
     UniProt JSON object.  Returns a dictionary with these fields.
 
+``load_entry(path, streaming=False)``
+    Decode a cached ``<uid>.json`` file.  In streaming mode only the parts
+    of the entry read by the extractors are materialised.
+
 ``iter_ids(csv_path)``
     Read a CSV file containing a ``uniprot_id`` column and yield each ID.
 
@@ -30,6 +34,10 @@ The most commonly used functions are:
 ``process(input_csv, output_csv, data_dir="uniprot")``
     Batch-process a CSV of UniProt IDs and write an output CSV with
     names and organism information for each ID.
+
+``refresh_cache(data_dir="uniprot")``
+    Re-download cached entries whose UniProt entry version has changed and
+    report updated, merged and obsolete accessions.
 """
 
 from __future__ import annotations
@@ -38,13 +46,43 @@ import csv
 import json
 import logging
 import os
-from typing import Any, Dict, Iterable, List, Set
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, Set, Tuple
 
 import requests
 from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from . import json_library as _jl
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .uniprot_release import UniProtRelease
+
+try:  # optional dependency used for selective streaming decoding
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:  # optional dependency for columnar (Parquet) output
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+try:  # advisory locks for caches shared between concurrent runs
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 # Shared HTTP session with retry/backoff to make network calls more robust.
@@ -59,13 +97,188 @@ _session.mount("http://", HTTPAdapter(max_retries=_retry))
 _session.mount("https://", HTTPAdapter(max_retries=_retry))
 
 API_URL = "https://rest.uniprot.org/uniprotkb/{id}.json"
+BATCH_URL = "https://rest.uniprot.org/uniprotkb/accessions"
+IDMAPPING_URL = "https://rest.uniprot.org/idmapping"
+
+# Name of the file inside the UniProt cache directory holding protein names
+# resolved for secondary accessions, keyed by accession.
+SECONDARY_NAMES_FILE = "secondary_names.json"
+# Cache index mapping input accessions to current primary accessions.
+ACCESSION_MAP_FILE = "accession_map.json"
+# Advisory lock file inside the cache directory, see :func:`_cache_lock`.
+LOCK_FILE = ".cache.lock"
+
+# UniProt return fields covering everything the ``extract_*`` helpers and
+# :func:`refresh_cache` read. Used as the projection profile when downloads
+# are restricted to those fields.
+EXTRACTOR_FIELDS = ",".join(
+    [
+        "accession",
+        "id",
+        "sec_acc",
+        "version",
+        "protein_name",
+        "ec",
+        "gene_names",
+        "organism_name",
+        "organism_id",
+        "lineage",
+        "keyword",
+        "cc_subcellular_location",
+        "cc_alternative_products",
+        "cc_catalytic_activity",
+        "ft_transmem",
+        "ft_intramem",
+        "ft_carbohyd",
+        "ft_lipid",
+        "ft_disulfid",
+        "ft_mod_res",
+        "ft_signal",
+        "ft_propep",
+        "xref_guidetopharmacology",
+        "xref_supfam",
+        "xref_prosite",
+        "xref_interpro",
+        "xref_pfam",
+        "xref_prints",
+        "xref_tcdb",
+    ]
+)
+
+# Return fields needed to resolve secondary accession names.
+NAME_FIELDS = "accession,sec_acc,protein_name"
+
+# Top-level key added to cached entries downloaded with a field projection.
+# It records the requested fields so a later full-entry request re-fetches.
+FIELDS_MARKER = "_fields"
+
+# Top-level entry keys consumed by the ``extract_*`` helpers.  Streaming mode
+# only materialises these; ``references``, ``sequence`` and friends are skipped.
+STREAM_KEYS: frozenset[str] = frozenset(
+    {
+        "entryType",
+        "primaryAccession",
+        "secondaryAccessions",
+        "uniProtkbId",
+        "entryAudit",
+        "organism",
+        "proteinDescription",
+        "genes",
+        "comments",
+        "features",
+        "keywords",
+        "uniProtKBCrossReferences",
+        "uniProtCrossReferences",
+        "dbReferences",
+        FIELDS_MARKER,
+    }
+)
+
+# Output formats understood by :func:`process`.
+OUTPUT_FORMATS = ("csv", "parquet")
+
+# Columns of :func:`process` output; ``resolve`` adds ``current_uniprot_id``
+# after ``uniprot_id``.
+OUTPUT_COLUMNS: Tuple[str, ...] = (
+    "uniprot_id",
+    "names",
+    "genus",
+    "superkingdom",
+    "phylum",
+    "taxon_id",
+    "molecular_function",
+    "cellular_component",
+    "ec_numbers",
+    "subcellular_location",
+    "topology",
+    "transmembrane",
+    "intramembrane",
+    "glycosylation",
+    "lipidation",
+    "disulfide_bond",
+    "modified_residue",
+    "phosphorylation",
+    "acetylation",
+    "ubiquitination",
+    "signal_peptide",
+    "propeptide",
+    "isoform_names",
+    "isoform_ids",
+    "isoform_synonyms",
+    "GuidetoPHARMACOLOGY",
+    "family",
+    "SUPFAM",
+    "PROSITE",
+    "InterPro",
+    "Pfam",
+    "PRINTS",
+    "TCDB",
+    "reactions",
+    "reaction_ec_numbers",
+    "uniProtkbId",
+    "secondaryAccessions",
+    "recommendedName",
+    "geneName",
+    "secondaryAccessionNames",
+)
+
+# Columnar output types. Pipe-joined values become string lists (the
+# ``"None"``/``"N/A"`` placeholders become empty lists), flags stay booleans
+# and the low-cardinality taxonomy columns are dictionary encoded.
+LIST_COLUMNS: frozenset[str] = frozenset(
+    {
+        "names",
+        "molecular_function",
+        "cellular_component",
+        "ec_numbers",
+        "subcellular_location",
+        "topology",
+        "isoform_names",
+        "isoform_ids",
+        "isoform_synonyms",
+        "GuidetoPHARMACOLOGY",
+        "family",
+        "SUPFAM",
+        "PROSITE",
+        "InterPro",
+        "Pfam",
+        "PRINTS",
+        "TCDB",
+        "reactions",
+        "reaction_ec_numbers",
+        "secondaryAccessions",
+        "secondaryAccessionNames",
+    }
+)
+BOOL_COLUMNS: frozenset[str] = frozenset(
+    {
+        "transmembrane",
+        "intramembrane",
+        "glycosylation",
+        "lipidation",
+        "disulfide_bond",
+        "modified_residue",
+        "phosphorylation",
+        "acetylation",
+        "ubiquitination",
+        "signal_peptide",
+        "propeptide",
+    }
+)
+CATEGORY_COLUMNS: frozenset[str] = frozenset(
+    {"genus", "superkingdom", "phylum", "taxon_id"}
+)
 
 __all__ = [
     "fetch_uniprot",
+    "fetch_uniprot_batch",
+    "EXTRACTOR_FIELDS",
     "extract_names",
     "extract_uniprotkb_id",
     "extract_secondary_accessions",
     "extract_names_for_secondary_accessions",
+    "resolve_secondary_names",
+    "resolve_accessions",
     "extract_recommended_name",
     "extract_gene_name",
     "extract_keywords",
@@ -74,19 +287,26 @@ __all__ = [
     "extract_ptm",
     "extract_activity",
     "extract_organism",
+    "load_entry",
     "iter_ids",
     "collect_info",
+    "collect_records",
     "process",
+    "OUTPUT_FORMATS",
+    "refresh_cache",
 ]
 
 
-def fetch_uniprot(uniprot_id: str) -> Dict[str, Any]:
+def fetch_uniprot(uniprot_id: str, fields: str | None = None) -> Dict[str, Any]:
     """Fetch a UniProt JSON record from the public REST API.
 
     Parameters
     ----------
     uniprot_id:
         UniProt accession identifier to retrieve.
+    fields:
+        Optional comma-separated UniProt return fields, e.g.
+        :data:`EXTRACTOR_FIELDS`. The full entry is returned when omitted.
 
     Returns
     -------
@@ -97,10 +317,11 @@ def fetch_uniprot(uniprot_id: str) -> Dict[str, Any]:
 
     url = API_URL.format(id=uniprot_id)
     try:
-        resp = _session.get(url, timeout=30)
+        params = {"fields": fields} if fields else None
+        resp = _session.get(url, params=params, timeout=30)
         resp.raise_for_status()
         try:
-            return resp.json()
+            return _jl.response_json(resp)
         except json.JSONDecodeError as exc:  # pragma: no cover - malformed JSON
             logger.warning("Failed to decode JSON for UniProt %s: %s", uniprot_id, exc)
             return {}
@@ -109,6 +330,236 @@ def fetch_uniprot(uniprot_id: str) -> Dict[str, Any]:
         return {}
 
 
+def _covers_fields(entry: Dict[str, Any], fields: str | None) -> bool:
+    """Return ``True`` if cached ``entry`` holds everything ``fields`` asks for.
+
+    Entries without :data:`FIELDS_MARKER` are full records and satisfy any
+    request. Projected entries satisfy only requests for a subset of their
+    fields, never a full-entry request (``fields`` of ``None``).
+    """
+
+    marker = entry.get(FIELDS_MARKER)
+    if marker is None:
+        return True
+    if fields is None:
+        return False
+    return set(fields.split(",")) <= set(str(marker).split(","))
+
+
+# Cached entries are written with :data:`FIELDS_MARKER` as their last key,
+# so the marker of a projected entry is found near the end of its file.
+_MARKER_RE = re.compile(rb'"%s"\s*:\s*"([^"]*)"\s*}\s*$' % FIELDS_MARKER.encode())
+_MARKER_TAIL = 4096
+
+
+def _needs_fetch(uid: str, data_dir: str, fields: str | None) -> bool:
+    """Return ``True`` unless the cache holds an entry for ``uid`` covering ``fields``.
+
+    Only the tail of the cache file is read, where :func:`_fetch_and_cache`
+    and :func:`refresh_cache` put the projection marker, so the check is
+    cheap enough for the prefetcher. :func:`collect_info` still verifies the
+    decoded entry.
+    """
+
+    path = os.path.join(data_dir, f"{uid}.json")
+    try:
+        with open(path, "rb") as handle:
+            size = handle.seek(0, os.SEEK_END)
+            handle.seek(max(0, size - _MARKER_TAIL))
+            tail = handle.read()
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+    match = _MARKER_RE.search(tail)
+    if match is None:
+        return False
+    return not _covers_fields({FIELDS_MARKER: match.group(1).decode()}, fields)
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """Write ``data`` to ``path`` so readers never observe a partial file.
+
+    The JSON is written to a temporary file in the same directory, flushed
+    to disk and renamed over ``path``. A crash leaves at most a stray
+    ``*.tmp`` file behind, never a truncated cache entry.
+    """
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _cache_lock(data_dir: str, enabled: bool = True) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``data_dir`` while active.
+
+    Entry files need no lock because :func:`_write_json_atomic` replaces
+    them atomically. The lock serialises read-modify-write updates of
+    shared index files such as :data:`SECONDARY_NAMES_FILE` between
+    processes. It is a no-op when disabled or where :mod:`fcntl` is missing.
+    """
+
+    if not enabled or fcntl is None:
+        yield
+        return
+    os.makedirs(data_dir, exist_ok=True)
+    with open(os.path.join(data_dir, LOCK_FILE), "a", encoding="utf-8") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def fetch_uniprot_batch(
+    accessions: Iterable[str], *, chunk_size: int = 100, fields: str | None = None
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch several UniProt entries with bulk requests.
+
+    Parameters
+    ----------
+    accessions:
+        Accessions to retrieve. Duplicates are requested once.
+    chunk_size:
+        Number of accessions sent per request.
+    fields:
+        Optional comma-separated UniProt return fields. Full entries are
+        returned when omitted.
+
+    Returns
+    -------
+    dict
+        Mapping of each requested accession to its entry. Secondary
+        accessions map to the entry they were merged into and accessions
+        UniProt does not return map to an empty dictionary. Accessions from
+        failed requests are absent so callers can retry them later.
+    """
+
+    unique = list(dict.fromkeys(a for a in accessions if a))
+    result: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(unique), chunk_size):
+        chunk = unique[start : start + chunk_size]
+        params = {"accessions": ",".join(chunk), "format": "json", "size": len(chunk)}
+        if fields:
+            params["fields"] = fields
+        try:
+            resp = _session.get(BATCH_URL, params=params, timeout=60)
+            resp.raise_for_status()
+            entries = _jl.response_json(resp).get("results") or []
+        except (requests.RequestException, ValueError) as exc:  # pragma: no cover - network
+            logger.warning("UniProt batch request failed for %d accessions: %s", len(chunk), exc)
+            continue
+        wanted = set(chunk)
+        result.update({acc: {} for acc in chunk})
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            keys = {entry.get("primaryAccession"), *(entry.get("secondaryAccessions") or [])}
+            for acc in keys & wanted:
+                result[acc] = entry
+    return result
+
+
+@lru_cache(maxsize=None)
+def _stream_skipped(prefix: str) -> bool:
+    """Return ``True`` when the ijson ``prefix`` is not needed by extractors.
+
+    Evidence lists and cross-reference properties are never read, and of each
+    feature only its ``type`` is used, so location payloads are dropped.  The
+    set of distinct prefixes is small, hence the unbounded cache.
+    """
+
+    parts = prefix.split(".")
+    if "evidences" in parts:
+        return True
+    if parts[0] == "features" and len(parts) > 2:
+        return parts[2] != "type"
+    if parts[0] in {"uniProtKBCrossReferences", "uniProtCrossReferences", "dbReferences"}:
+        return len(parts) > 2 and parts[2] not in {"database", "id"}
+    return False
+
+
+def _load_entry_streaming(handle: Any) -> Dict[str, Any]:
+    """Incrementally decode ``handle`` keeping only :data:`STREAM_KEYS`."""
+
+    entry: Dict[str, Any] = {}
+    key = ""
+    builder = None
+    for prefix, event, value in ijson.parse(handle, use_float=True):
+        if not prefix:
+            # Events on the root object: a key opens a new top-level value.
+            if event == "map_key":
+                if builder is not None:
+                    entry[key] = builder.value
+                key = value
+                builder = ijson.ObjectBuilder() if value in STREAM_KEYS else None
+            elif event == "end_map" and builder is not None:
+                entry[key] = builder.value
+                builder = None
+            continue
+        if builder is None:
+            continue
+        if event == "map_key" and _stream_skipped(f"{prefix}.{value}"):
+            continue
+        if _stream_skipped(prefix):
+            continue
+        builder.event(event, value)
+    return entry
+
+
+def load_entry(path: str, *, streaming: bool = False) -> Dict[str, Any]:
+    """Decode a cached UniProt JSON entry from ``path``.
+
+    Parameters
+    ----------
+    path:
+        Location of a ``<uid>.json`` file.
+    streaming:
+        When ``True`` and :mod:`ijson` is installed, the file is parsed
+        incrementally and only the paths listed in :data:`STREAM_KEYS` are
+        materialised.  References, the sequence, evidences and feature
+        locations are skipped, which keeps peak memory per entry small.
+        Without :mod:`ijson` the whole document is decoded with the fast
+        backend of :mod:`library.json_library`.
+
+    Returns
+    -------
+    dict
+        Decoded UniProt entry.
+
+    Raises
+    ------
+    FileNotFoundError
+        If ``path`` does not exist.
+    json.JSONDecodeError
+        If the file does not contain valid JSON.
+    """
+
+    if streaming and ijson is not None:
+        with open(path, "rb") as handle:
+            try:
+                return _load_entry_streaming(handle)
+            except ijson.JSONError as exc:
+                raise json.JSONDecodeError(str(exc), "", 0) from exc
+    with open(path, "rb") as handle:
+        return _jl.load(handle)
+
+
 def _collect_name_fields(name_obj: Dict[str, Any]) -> Iterable[str]:
     """Yield all full and short names from a UniProt name object."""
     if not isinstance(name_obj, dict):
@@ -190,6 +641,69 @@ def extract_names(data: Any) -> Set[str]:
     return names
 
 
+# Lookup tables shared by the entries of a batch. Organisms and keywords
+# repeat across large batches, so each distinct lineage or keyword is decoded
+# once and all rows reference the same interned strings. The tables are only
+# filled inside :func:`_shared_values` and are emptied when the last active
+# scope exits, so nothing is retained between runs.
+_TAXONOMY: Dict[Any, Dict[str, str]] = {}
+_KEYWORDS: Dict[Tuple[Any, ...], Tuple[str, str]] = {}
+_STRINGS: Dict[str, str] = {}
+_sharing = 0
+_sharing_lock = threading.Lock()
+
+
+@contextmanager
+def _shared_values() -> Iterator[None]:
+    """Share repeated values between the entries parsed while active."""
+
+    global _sharing
+    with _sharing_lock:
+        _sharing += 1
+    try:
+        yield
+    finally:
+        with _sharing_lock:
+            _sharing -= 1
+            if not _sharing:
+                _TAXONOMY.clear()
+                _KEYWORDS.clear()
+                _STRINGS.clear()
+
+
+def _intern(value: Any) -> Any:
+    """Return the canonical copy of string ``value``; other values unchanged."""
+
+    if type(value) is not str or not _sharing:
+        return value
+    return _STRINGS.setdefault(value, value)
+
+
+def _organism_fields(org: Dict[str, Any]) -> Dict[str, str]:
+    result = {"genus": "", "superkingdom": "", "phylum": "", "taxon_id": ""}
+    taxon_id = org.get("taxonId")
+    if taxon_id is not None:
+        result["taxon_id"] = str(taxon_id)
+    lineage = org.get("lineage") or []
+    if isinstance(lineage, list) and lineage:
+        result["superkingdom"] = lineage[0]
+        if len(lineage) >= 2:
+            candidate = lineage[1]
+            if (
+                isinstance(candidate, str)
+                and candidate.endswith("zoa")
+                and len(lineage) >= 3
+            ):
+                result["phylum"] = lineage[2]
+            else:
+                result["phylum"] = candidate
+        result["genus"] = lineage[-1]
+    sci_name = org.get("scientificName")
+    if sci_name and not result["genus"]:
+        result["genus"] = sci_name.split()[0]
+    return {key: _intern(value) for key, value in result.items()}
+
+
 def extract_organism(data: Any) -> Dict[str, str]:
     """Return organism taxonomy information for the entry in ``data``.
 
@@ -214,26 +728,22 @@ def extract_organism(data: Any) -> Dict[str, str]:
         org = entry.get("organism", {})
         if not isinstance(org, dict):
             continue
-        taxon_id = org.get("taxonId")
-        if taxon_id is not None:
-            result["taxon_id"] = str(taxon_id)
-        lineage = org.get("lineage") or []
-        if isinstance(lineage, list) and lineage:
-            result["superkingdom"] = lineage[0]
-            if len(lineage) >= 2:
-                candidate = lineage[1]
-                if (
-                    isinstance(candidate, str)
-                    and candidate.endswith("zoa")
-                    and len(lineage) >= 3
-                ):
-                    result["phylum"] = lineage[2]
-                else:
-                    result["phylum"] = candidate
-            result["genus"] = lineage[-1]
-        sci_name = org.get("scientificName")
-        if sci_name and not result["genus"]:
-            result["genus"] = sci_name.split()[0]
+        # The key holds everything the fields derive from, so a partial or
+        # malformed record never reuses the lineage of another entry.
+        lineage = org.get("lineage")
+        key = (
+            org.get("taxonId"),
+            org.get("scientificName"),
+            tuple(lineage) if isinstance(lineage, list) else lineage,
+        )
+        table = _TAXONOMY if _sharing else {}
+        try:
+            fields = table.get(key)
+        except TypeError:  # unhashable values in a malformed entry
+            return _organism_fields(org)
+        if fields is None:
+            fields = table[key] = _organism_fields(org)
+        result.update(fields)
         break
     return result
 
@@ -374,19 +884,128 @@ def extract_gene_name(data: Any) -> str | None:
         break
     return None
 
-def extract_names_for_secondary_accessions(data: Any) -> str:
+# Parsed cache index files keyed by path, with the modification time and
+# size they were read at. Bounded by the number of index files in use.
+_INDEXES: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def _load_index(data_dir: str, name: str) -> Dict[str, Any]:
+    """Return the JSON object stored in the cache index file ``name``.
+
+    The parsed object is reused until the file's modification time or size
+    changes, so repeated lookups do not parse the whole index again.
+    Callers must not modify the returned dictionary.
+    """
+
+    path = os.path.join(data_dir, name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size)
+    hit = _INDEXES.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    try:
+        with open(path, "rb") as handle:
+            cached = _jl.load(handle)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        logger.warning("ignoring malformed UniProt cache index: %s", path)
+        return {}
+    cached = cached if isinstance(cached, dict) else {}
+    _INDEXES[path] = (key, cached)
+    return cached
+
+
+def _store_index(data_dir: str, name: str, data: Dict[str, Any]) -> None:
+    """Atomically write the cache index ``name`` and remember it as parsed."""
+
+    path = os.path.join(data_dir, name)
+    _write_json_atomic(path, data)
+    stat = os.stat(path)
+    _INDEXES[path] = ((stat.st_mtime_ns, stat.st_size), data)
+
+
+def resolve_secondary_names(
+    accessions: Iterable[str],
+    data_dir: str = "uniprot",
+    *,
+    lock: bool = False,
+    release: UniProtRelease | None = None,
+) -> Dict[str, List[str]]:
+    """Return protein names for each of ``accessions`` using a local cache.
+
+    Accessions missing from ``<data_dir>/secondary_names.json`` are fetched
+    in bulk via :func:`fetch_uniprot_batch` and added to the cache.
+    Accessions that UniProt no longer returns are cached with an empty list
+    so they are not requested again; failed requests are not cached.
+
+    Parameters
+    ----------
+    accessions:
+        Secondary accession identifiers. Duplicates are resolved once.
+    data_dir:
+        UniProt cache directory.
+    lock:
+        Hold the cache lock while merging new names into the cache file, so
+        concurrent runs sharing ``data_dir`` do not drop each other's
+        updates.
+    release:
+        Local release to look names up in instead of the cache and the
+        network.
+
+    Returns
+    -------
+    dict
+        Mapping of accession to a sorted list of protein names.
+    """
+
+    wanted = list(dict.fromkeys(a for a in accessions if a))
+    if release is not None:
+        return {
+            acc: sorted(_extract_protein_names(release.get(acc).get("proteinDescription", {})))
+            for acc in wanted
+        }
+    cached = _load_index(data_dir, SECONDARY_NAMES_FILE)
+    missing = [acc for acc in wanted if acc not in cached]
+    fetched = fetch_uniprot_batch(missing, fields=NAME_FIELDS) if missing else {}
+    names = {
+        acc: sorted(_extract_protein_names(entry.get("proteinDescription", {})))
+        for acc, entry in fetched.items()
+    }
+    if names:
+        logger.info("resolved names for %d secondary accessions", len(names))
+        try:
+            with _cache_lock(data_dir, lock):
+                # Re-read under the lock to keep entries added by other runs.
+                merged = dict(_load_index(data_dir, SECONDARY_NAMES_FILE))
+                merged.update(names)
+                _store_index(data_dir, SECONDARY_NAMES_FILE, merged)
+        except OSError as exc:  # pragma: no cover - disk I/O failure
+            logger.warning("unable to write secondary accession cache: %s", exc)
+    return {acc: names[acc] if acc in names else cached.get(acc, []) for acc in wanted}
+
+
+def extract_names_for_secondary_accessions(
+    data: Any, names: Dict[str, List[str]] | None = None
+) -> str:
     """Return protein names for secondary accessions listed in ``data``.
 
-    The function looks up each secondary accession via :func:`fetch_uniprot`
-    and aggregates all protein names from common description fields. Names are
-    deduplicated and returned as a single pipe-separated string. When no names
-    are found or the entry cannot be retrieved, an empty string is returned.
+    Names are deduplicated and returned as a single pipe-separated string.
+    When no names are found or the entries cannot be retrieved, an empty
+    string is returned.
 
     Parameters
     ----------
     data:
         A UniProt JSON structure, list of entries, or search results containing
         UniProt entries.
+    names:
+        Pre-resolved names keyed by accession, as returned by
+        :func:`resolve_secondary_names`. When omitted, each secondary
+        accession is looked up via :func:`fetch_uniprot`.
 
     Returns
     -------
@@ -394,15 +1013,19 @@ def extract_names_for_secondary_accessions(data: Any) -> str:
         Pipe-separated protein names for all secondary accessions.
     """
 
-    names: Set[str] = set()
+    result: Set[str] = set()
     for acc in extract_secondary_accessions(data):
+        if names is not None:
+            result.update(names.get(acc, []))
+            continue
         entry = fetch_uniprot(acc)
         if not isinstance(entry, dict):
             continue
         desc = entry.get("proteinDescription")
         if isinstance(desc, dict):
-            names.update(_extract_protein_names(desc))
-    return "|".join(sorted(names))
+            result.update(_extract_protein_names(desc))
+    return "|".join(sorted(result))
+
 
 def _collect_ec_numbers(name_obj: Dict[str, Any]) -> Iterable[str]:
     """Yield EC numbers from a UniProt name object."""
@@ -465,17 +1088,30 @@ def extract_keywords(data: Any) -> Dict[str, Any]:
             continue
 
         # Keyword extraction
+        table = _KEYWORDS if _sharing else {}
         for kw in entry.get("keywords", []):
             if not isinstance(kw, dict):
                 continue
             category = kw.get("category")
-            if isinstance(category, dict):
-                category = category.get("value")
             name = kw.get("name")
-            if isinstance(name, dict):
-                name = name.get("value")
-            if not isinstance(name, str):
-                continue
+            try:
+                category, name = table[(category, name)]
+            except KeyError:
+                raw = (category, name)
+                if isinstance(category, dict):
+                    category = category.get("value")
+                if isinstance(name, dict):
+                    name = name.get("value")
+                if not isinstance(name, str):
+                    continue
+                category, name = table[raw] = (_intern(category), _intern(name))
+            except TypeError:  # dict-valued fields are not hashable
+                if isinstance(category, dict):
+                    category = category.get("value")
+                if isinstance(name, dict):
+                    name = name.get("value")
+                if not isinstance(name, str):
+                    continue
             if category == "Molecular function":
                 result["molecular_function"].add(name)
             elif category == "Cellular component":
@@ -508,12 +1144,12 @@ def extract_keywords(data: Any) -> Dict[str, Any]:
                     if isinstance(sub, dict):
                         value = sub.get("value")
                         if isinstance(value, str):
-                            result["subcellular_location"].add(value)
+                            result["subcellular_location"].add(_intern(value))
                     topo = loc.get("topology")
                     if isinstance(topo, dict):
                         value = topo.get("value")
                         if isinstance(value, str):
-                            result["topology"].add(value)
+                            result["topology"].add(_intern(value))
 
         # Feature flags for membranes
         features = entry.get("features", [])
@@ -789,22 +1425,87 @@ def iter_ids(csv_path: str, sep: str = ",", encoding: str = "utf-8") -> Iterable
     except csv.Error as exc:
         raise ValueError(f"malformed CSV in file: {csv_path}: {exc}") from exc
 
-def collect_info(uid: str, data_dir: str = "uniprot") -> Dict[str, Any]:
-    """Return names, organism, keyword, PTM, isoform, cross-ref, and activity data for ``uid``.
 
-    Args:
-        uid: UniProt accession identifier.
-        data_dir: Directory containing ``<uid>.json`` files with UniProt data.
+def _fetch_and_cache(
+    uid: str, data_dir: str, fields: str | None = None
+) -> Dict[str, Any]:
+    """Download ``uid`` and store it as ``<data_dir>/<uid>.json``.
 
-    Returns:
-        A dictionary with keys ``uniprot_id``, ``names``, organism taxonomy
-        fields, keyword categories, EC numbers, subcellular location data,
-        membrane features, post-translational modification flags, isoform
-        metadata, and selected database cross references. Missing or invalid
-        files leave fields empty.
+    Returns the entry, or an empty dictionary when the download fails. A
+    failure to write the cache file is logged but the entry is still
+    returned. Projected downloads are tagged with :data:`FIELDS_MARKER`.
     """
-    json_path = os.path.join(data_dir, f"{uid}.json")
-    result = {
+
+    logger.info("downloading UniProt JSON for %s", uid)
+    data = fetch_uniprot(uid, fields) if fields else fetch_uniprot(uid)
+    if not data:
+        return {}
+    if fields:
+        data[FIELDS_MARKER] = fields
+    try:
+        _write_json_atomic(os.path.join(data_dir, f"{uid}.json"), data)
+    except OSError as exc:  # pragma: no cover - disk I/O failure
+        logger.warning("unable to write UniProt JSON for %s: %s", uid, exc)
+    return data
+
+
+def _iter_entries(
+    ids: Iterable[str],
+    data_dir: str,
+    *,
+    workers: int,
+    lookahead: int,
+    fields: str | None = None,
+    release: UniProtRelease | None = None,
+) -> Iterator[Tuple[str, Dict[str, Any] | None]]:
+    """Yield ``(uid, entry)`` pairs in input order while prefetching.
+
+    Accessions without a cached file, or whose cached projection lacks
+    ``fields`` (see :func:`_needs_fetch`), are downloaded by a pool of
+    ``workers`` threads up to ``lookahead`` positions ahead of the consumer,
+    so parsing of cached entries overlaps with network transfers. ``entry`` is ``None``
+    for accessions already in the cache, and the downloaded entry (empty on
+    failure) otherwise. With ``workers`` below one, nothing is prefetched.
+    Downloads use the ``fields`` projection. With a local ``release`` every
+    entry is read from it and nothing is downloaded.
+    """
+
+    if release is not None:
+        for uid in ids:
+            yield uid, release.get(uid)
+        return
+    if workers < 1:
+        for uid in ids:
+            yield uid, None
+        return
+    window: Deque[Tuple[str, Future | None]] = deque()
+    pending: Dict[str, Future] = {}
+
+    def _next() -> Tuple[str, Dict[str, Any] | None]:
+        uid, future = window.popleft()
+        if future is None:
+            return uid, None
+        pending.pop(uid, None)
+        return uid, future.result()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for uid in ids:
+            future = pending.get(uid)
+            if future is None and _needs_fetch(uid, data_dir, fields):
+                future = pool.submit(_fetch_and_cache, uid, data_dir, fields)
+                pending[uid] = future
+            window.append((uid, future))
+            # The window bounds both memory and how far downloads run ahead.
+            while len(window) > lookahead:
+                yield _next()
+        while window:
+            yield _next()
+
+
+def _empty_info(uid: str) -> Dict[str, Any]:
+    """Return the :func:`collect_info` row used when no entry is available."""
+
+    return {
         "uniprot_id": uid,
         "names": "",
         "genus": "",
@@ -842,24 +1543,68 @@ def collect_info(uid: str, data_dir: str = "uniprot") -> Dict[str, Any]:
         "reaction_ec_numbers": "",
         "secondaryAccessionNames": "",
     }
+
+
+def collect_info(
+    uid: str,
+    data_dir: str = "uniprot",
+    *,
+    streaming: bool = False,
+    secondary_names: Dict[str, List[str]] | None = None,
+    entry: Dict[str, Any] | None = None,
+    lock: bool = False,
+    fields: str | None = None,
+    release: UniProtRelease | None = None,
+) -> Dict[str, Any]:
+    """Return names, organism, keyword, PTM, isoform, cross-ref, and activity data for ``uid``.
+
+    Args:
+        uid: UniProt accession identifier.
+        data_dir: Directory containing ``<uid>.json`` files with UniProt data.
+        streaming: Decode cached files selectively via :func:`load_entry`.
+        secondary_names: Protein names keyed by secondary accession, as
+            returned by :func:`resolve_secondary_names`. When omitted the
+            entry's secondary accessions are resolved through the cache in
+            ``data_dir``, which may download missing names and rewrite the
+            cache on every call. Batch callers should resolve all entries'
+            secondary accessions once and pass the result, as
+            :func:`collect_records` does.
+        entry: Already downloaded entry to use instead of the cache file. An
+            empty dictionary marks a failed download.
+        lock: Lock shared cache index files while updating them. See
+            :func:`resolve_secondary_names`.
+        fields: UniProt return fields to download, e.g.
+            :data:`EXTRACTOR_FIELDS`. ``None`` requests full entries, and a
+            cached projected entry that lacks requested fields is
+            downloaded again.
+        release: Local :class:`~library.uniprot_release.UniProtRelease` to
+            read the entry and secondary accession names from instead of
+            ``data_dir`` and the network.
+
+    Returns:
+        A dictionary with keys ``uniprot_id``, ``names``, organism taxonomy
+        fields, keyword categories, EC numbers, subcellular location data,
+        membrane features, post-translational modification flags, isoform
+        metadata, and selected database cross references. Missing or invalid
+        files leave fields empty.
+    """
+    json_path = os.path.join(data_dir, f"{uid}.json")
+    result = _empty_info(uid)
+    if entry is None and release is not None:
+        entry = release.get(uid)
     try:
-        with open(json_path, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
+        data = entry if entry is not None else load_entry(json_path, streaming=streaming)
     except FileNotFoundError:
-        logger.info("downloading UniProt JSON for %s", uid)
-        data = fetch_uniprot(uid)
-        if not data:
-            logger.warning("failed to retrieve UniProt JSON for %s", uid)
-            return result
-        os.makedirs(data_dir, exist_ok=True)
-        try:
-            with open(json_path, "w", encoding="utf-8") as handle:
-                json.dump(data, handle)
-        except OSError as exc:  # pragma: no cover - disk I/O failure
-            logger.warning("unable to write UniProt JSON for %s: %s", uid, exc)
-            return result
+        data = _fetch_and_cache(uid, data_dir, fields)
     except json.JSONDecodeError:
-        logger.warning("malformed UniProt JSON for %s", uid)
+        # Typically a file truncated by an interrupted pre-atomic write.
+        logger.warning("malformed UniProt JSON for %s, downloading again", uid)
+        data = _fetch_and_cache(uid, data_dir, fields)
+    if isinstance(data, dict) and data and not _covers_fields(data, fields):
+        logger.info("cached UniProt JSON for %s is a projection, downloading again", uid)
+        data = _fetch_and_cache(uid, data_dir, fields)
+    if not isinstance(data, dict) or not data:
+        logger.warning("failed to retrieve UniProt JSON for %s", uid)
         return result
 
     names = extract_names(data)
@@ -871,17 +1616,19 @@ def collect_info(uid: str, data_dir: str = "uniprot") -> Dict[str, Any]:
     activity = extract_activity(data)
     result["names"] = "|".join(sorted(names))
     result.update(org)
-    result["molecular_function"] = "|".join(
-        sorted(keywords["molecular_function"])
+    # Keyword combinations recur across entries; interning the joined values
+    # lets rows share them instead of holding one copy each.
+    result["molecular_function"] = _intern(
+        "|".join(sorted(keywords["molecular_function"]))
+    )
+    result["cellular_component"] = _intern(
+        "|".join(sorted(keywords["cellular_component"]))
     )
-    result["cellular_component"] = "|".join(
-        sorted(keywords["cellular_component"])
+    result["ec_numbers"] = _intern("|".join(sorted(keywords["ec_numbers"])))
+    result["subcellular_location"] = _intern(
+        "|".join(sorted(keywords["subcellular_location"])) or "N/A"
     )
-    result["ec_numbers"] = "|".join(sorted(keywords["ec_numbers"]))
-    result["subcellular_location"] = "|".join(
-        sorted(keywords["subcellular_location"])
-    ) or "N/A"
-    result["topology"] = "|".join(sorted(keywords["topology"])) or "N/A"
+    result["topology"] = _intern("|".join(sorted(keywords["topology"])) or "N/A")
     result["transmembrane"] = ptm["transmembrane"]
     result["intramembrane"] = keywords["intramembrane"]
     for key in (
@@ -903,10 +1650,134 @@ def collect_info(uid: str, data_dir: str = "uniprot") -> Dict[str, Any]:
     result["secondaryAccessions"] = extract_secondary_accessions(data)
     result["recommendedName"] = extract_recommended_name(data)
     result["geneName"] = extract_gene_name(data)
-    result["secondaryAccessionNames"] = extract_names_for_secondary_accessions(data)
+    if secondary_names is None:
+        secondary_names = resolve_secondary_names(
+            result["secondaryAccessions"], data_dir, lock=lock, release=release
+        )
+    result["secondaryAccessionNames"] = extract_names_for_secondary_accessions(
+        data, secondary_names
+    )
     return result
 
 
+def _split_pipe(value: Any) -> List[str]:
+    """Return ``value`` as a list, splitting pipe-joined strings."""
+
+    if isinstance(value, list):
+        return value
+    if value in (None, "", "None", "N/A"):
+        return []
+    return str(value).split("|")
+
+
+def _write_parquet(rows: List[Dict[str, Any]], fieldnames: List[str], path: str) -> None:
+    """Write ``rows`` to ``path`` as Parquet using the columnar types above."""
+
+    columns = {}
+    for name in fieldnames:
+        values = [row.get(name) for row in rows]
+        if name in BOOL_COLUMNS:
+            columns[name] = pa.array([bool(v) for v in values], pa.bool_())
+        elif name in LIST_COLUMNS:
+            columns[name] = pa.array(
+                [_split_pipe(v) for v in values], pa.list_(pa.string())
+            )
+        else:
+            array = pa.array(
+                [None if v is None else str(v) for v in values], pa.string()
+            )
+            columns[name] = (
+                array.dictionary_encode() if name in CATEGORY_COLUMNS else array
+            )
+    pq.write_table(pa.table(columns), path)
+
+
+def collect_records(
+    ids: Iterable[str],
+    data_dir: str = "uniprot",
+    *,
+    streaming: bool = False,
+    workers: int = 4,
+    lookahead: int = 64,
+    lock: bool = False,
+    fields: str | None = None,
+    resolve: bool = False,
+    release: UniProtRelease | None = None,
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Return the output columns and one :func:`collect_info` row per ID.
+
+    This is the in-memory part of :func:`process`: the keyword arguments
+    have the same meaning there, and rows hold the values before they are
+    serialised, so flags are booleans and ``secondaryAccessions`` is a list.
+
+    Returns
+    -------
+    tuple
+        Column names in output order and the rows, in the order of ``ids``.
+    """
+
+    ids = list(ids)
+    fieldnames = list(OUTPUT_COLUMNS)
+    current: Dict[str, str] = {}
+    if resolve:
+        fieldnames.insert(1, "current_uniprot_id")
+        if release is not None:
+            # The release indexes secondary accessions under their entry.
+            current = {
+                uid: release.get(uid).get("primaryAccession", "") for uid in ids
+            }
+        else:
+            current = resolve_accessions(ids, data_dir, lock=lock)
+    # Accessions whose lookup failed are processed as given; demerged ones
+    # are represented by their first successor.
+    targets = [current.get(uid, uid).split("|")[0] for uid in ids]
+
+    # Secondary accession names are resolved for the whole batch at once:
+    # rows are collected with an empty lookup first, then all distinct
+    # secondary accessions are fetched in bulk and filled in.
+    entries = _iter_entries(
+        (target for target in targets if target),
+        data_dir,
+        workers=workers,
+        lookahead=lookahead,
+        fields=fields,
+        release=release,
+    )
+    rows: List[Dict[str, Any]] = []
+    # Rows share repeated taxonomy and keyword strings with each other.
+    with _shared_values():
+        for uid, target in zip(ids, targets):
+            if target:
+                _, entry = next(entries)
+                info = collect_info(
+                    target,
+                    data_dir,
+                    streaming=streaming,
+                    secondary_names={},
+                    entry=entry,
+                    fields=fields,
+                )
+                info["uniprot_id"] = uid
+            else:
+                logger.info("skipping obsolete UniProt accession %s", uid)
+                info = _empty_info(uid)
+            if resolve:
+                info["current_uniprot_id"] = current.get(uid, uid)
+            rows.append(info)
+    secondary = resolve_secondary_names(
+        (acc for row in rows for acc in row.get("secondaryAccessions", [])),
+        data_dir,
+        lock=lock,
+        release=release,
+    )
+    for info in rows:
+        accessions = info.get("secondaryAccessions", [])
+        info["secondaryAccessionNames"] = "|".join(
+            sorted({name for acc in accessions for name in secondary[acc]})
+        )
+    return fieldnames, rows
+
+
 def process(
     input_csv: str,
     output_csv: str,
@@ -914,6 +1785,14 @@ def process(
     *,
     sep: str = ",",
     encoding: str = "utf-8",
+    streaming: bool = False,
+    workers: int = 4,
+    lookahead: int = 64,
+    lock: bool = False,
+    fields: str | None = None,
+    resolve: bool = False,
+    release: UniProtRelease | None = None,
+    output_format: str = "csv",
 ) -> None:
     """Read IDs from ``input_csv`` and write extracted data to ``output_csv``.
 
@@ -934,63 +1813,326 @@ def process(
         Field delimiter used for both input and output CSV files. Defaults to a comma.
     encoding:
         File encoding for both input and output CSV files. Defaults to UTF-8.
+    streaming:
+        Decode cached JSON files selectively. See :func:`load_entry`.
+    workers:
+        Number of threads downloading entries missing from ``data_dir``
+        while cached entries are parsed. Zero downloads serially on demand.
+    lookahead:
+        How many accessions ahead of the parser downloads may run.
+    lock:
+        Lock shared cache index files while updating them. Enable this when
+        several runs share ``data_dir``.
+    fields:
+        UniProt return fields to download, typically
+        :data:`EXTRACTOR_FIELDS`. ``None`` downloads and requires full
+        entries.
+    resolve:
+        Map input accessions to current primaries with
+        :func:`resolve_accessions` first. Data is then taken from the current
+        entry, obsolete accessions yield empty rows without any download, and
+        a ``current_uniprot_id`` column follows ``uniprot_id``.
+    release:
+        Local :class:`~library.uniprot_release.UniProtRelease` serving all
+        entries, secondary accession names and, with ``resolve``, current
+        accessions. ``data_dir`` is neither read nor written and no network
+        requests are made.
+    output_format:
+        ``"csv"`` (default) or ``"parquet"``. Parquet output keeps flags as
+        booleans, stores pipe-joined fields as string lists and dictionary
+        encodes the taxonomy columns. It requires :mod:`pyarrow`; ``sep``
+        and ``encoding`` then only apply to ``input_csv``.
 
     Returns
     -------
     None
         The processed information is written to ``output_csv``.
-    """
 
-    fieldnames = [
-        "uniprot_id",
-        "names",
-        "genus",
-        "superkingdom",
-        "phylum",
-        "taxon_id",
-        "molecular_function",
-        "cellular_component",
-        "ec_numbers",
-        "subcellular_location",
-        "topology",
-        "transmembrane",
-        "intramembrane",
-        "glycosylation",
-        "lipidation",
-        "disulfide_bond",
-        "modified_residue",
-        "phosphorylation",
-        "acetylation",
-        "ubiquitination",
-        "signal_peptide",
-        "propeptide",
-        "isoform_names",
-        "isoform_ids",
-        "isoform_synonyms",
-        "GuidetoPHARMACOLOGY",
-        "family",
-        "SUPFAM",
-        "PROSITE",
-        "InterPro",
-        "Pfam",
-        "PRINTS",
-        "TCDB",
-        "reactions",
-        "reaction_ec_numbers",
-        "uniProtkbId",
-        "secondaryAccessions",
-        "recommendedName",
-        "geneName",
-        "secondaryAccessionNames",
-    ]
+    Raises
+    ------
+    ValueError
+        If ``output_format`` is unknown, or is ``"parquet"`` without
+        :mod:`pyarrow` installed.
+    """
 
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"unsupported output format: {output_format}")
+    if output_format == "parquet" and pa is None:
+        raise ValueError("parquet output requires the optional pyarrow package")
+
+    fieldnames, rows = collect_records(
+        iter_ids(input_csv, sep=sep, encoding=encoding),
+        data_dir,
+        streaming=streaming,
+        workers=workers,
+        lookahead=lookahead,
+        lock=lock,
+        fields=fields,
+        resolve=resolve,
+        release=release,
+    )
     try:
+        if output_format == "parquet":
+            _write_parquet(rows, fieldnames, output_csv)
+            return
         with open(output_csv, "w", newline="", encoding=encoding) as handle:
             writer = csv.DictWriter(handle, fieldnames=fieldnames, delimiter=sep)
             writer.writeheader()
-            for uid in iter_ids(input_csv, sep=sep, encoding=encoding):
-                info = collect_info(uid, data_dir)
-                info["secondaryAccessions"] = "|".join(info["secondaryAccessions"])
+            for info in rows:
+                info["secondaryAccessions"] = "|".join(info.get("secondaryAccessions", []))
                 writer.writerow(info)
     except OSError as exc:
         raise OSError(f"failed to write output CSV: {output_csv}: {exc}") from exc
+
+
+# Return fields needed to compare cached entries with the current release.
+VERSION_FIELDS = "accession,sec_acc,version,date_modified"
+
+
+def _idmapping_chunk(chunk: List[str]) -> Dict[str, str] | None:
+    """Map ``chunk`` to current primary accessions via the idmapping service.
+
+    Returns ``None`` when the job cannot be completed. Accessions absent
+    from the job results, or mapped only to deleted entries, map to an
+    empty string. Demerged accessions map to their pipe-joined successors.
+    """
+
+    try:
+        resp = _session.post(
+            f"{IDMAPPING_URL}/run",
+            data={"from": "UniProtKB_AC-ID", "to": "UniProtKB", "ids": ",".join(chunk)},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        job_id = _jl.response_json(resp).get("jobId")
+        if not job_id:
+            return None
+        for _ in range(30):
+            status = _session.get(f"{IDMAPPING_URL}/status/{job_id}", timeout=30)
+            status.raise_for_status()
+            state = _jl.response_json(status)
+            if state.get("jobStatus") == "FAILED":
+                return None
+            if state.get("jobStatus") == "FINISHED" or "results" in state:
+                break
+            time.sleep(1)
+        else:
+            logger.warning("UniProt idmapping job %s did not finish", job_id)
+            return None
+        targets: Dict[str, List[str]] = {acc: [] for acc in chunk}
+        url: str | None = f"{IDMAPPING_URL}/uniprotkb/results/{job_id}"
+        params: Dict[str, Any] | None = {"format": "json", "size": 500}
+        while url:
+            page = _session.get(url, params=params, timeout=60)
+            page.raise_for_status()
+            for item in _jl.response_json(page).get("results") or []:
+                source = item.get("from")
+                entry = item.get("to") or {}
+                if source not in targets or not isinstance(entry, dict):
+                    continue
+                if entry.get("entryType") == "Inactive":
+                    reason = entry.get("inactiveReason") or {}
+                    targets[source].extend(reason.get("mergeDemergeTo") or [])
+                elif entry.get("primaryAccession"):
+                    targets[source].append(entry["primaryAccession"])
+            # Further pages are linked from the response headers.
+            url = page.links.get("next", {}).get("url")
+            params = None
+    except (requests.RequestException, ValueError) as exc:  # pragma: no cover - network
+        logger.warning("UniProt idmapping failed for %d accessions: %s", len(chunk), exc)
+        return None
+    return {acc: "|".join(dict.fromkeys(ids)) for acc, ids in targets.items()}
+
+
+def resolve_accessions(
+    accessions: Iterable[str],
+    data_dir: str = "uniprot",
+    *,
+    chunk_size: int = 500,
+    lock: bool = False,
+) -> Dict[str, str]:
+    """Map accessions to current UniProtKB primary accessions.
+
+    Stale accessions (secondary, merged or demerged) are resolved in bulk
+    with the UniProt idmapping service (``UniProtKB_AC-ID`` to
+    ``UniProtKB``) and remembered in ``<data_dir>/accession_map.json``, so
+    each accession is looked up once across runs.
+
+    Parameters
+    ----------
+    accessions:
+        Accessions to resolve. Duplicates are resolved once.
+    data_dir:
+        UniProt cache directory holding the mapping cache.
+    chunk_size:
+        Number of accessions submitted per idmapping job.
+    lock:
+        Hold the cache lock while merging new mappings into the cache file.
+
+    Returns
+    -------
+    dict
+        Mapping of accession to its current primary accession. Up-to-date
+        accessions map to themselves, obsolete ones to an empty string and
+        demerged ones to their pipe-joined successors. Accessions whose
+        lookup failed are absent.
+    """
+
+    wanted = list(dict.fromkeys(a for a in accessions if a))
+    cached = _load_index(data_dir, ACCESSION_MAP_FILE)
+    found = {acc: cached[acc] for acc in wanted if acc in cached}
+    missing = [acc for acc in wanted if acc not in found]
+    resolved: Dict[str, str] = {}
+    for start in range(0, len(missing), chunk_size):
+        mapped = _idmapping_chunk(missing[start : start + chunk_size])
+        if mapped is not None:
+            resolved.update(mapped)
+    if resolved:
+        changed = sum(1 for acc, cur in resolved.items() if cur != acc)
+        logger.info("resolved %d accessions, %d stale", len(resolved), changed)
+        found.update(resolved)
+        try:
+            with _cache_lock(data_dir, lock):
+                merged = dict(_load_index(data_dir, ACCESSION_MAP_FILE))
+                merged.update(resolved)
+                _store_index(data_dir, ACCESSION_MAP_FILE, merged)
+        except OSError as exc:  # pragma: no cover - disk I/O failure
+            logger.warning("unable to write accession map cache: %s", exc)
+    return {acc: found[acc] for acc in wanted if acc in found}
+
+
+def _cached_accessions(data_dir: str) -> List[str]:
+    """Return accessions with an entry file in ``data_dir``."""
+
+    try:
+        names = os.listdir(data_dir)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        name[: -len(".json")]
+        for name in names
+        if name.endswith(".json")
+        and not name.startswith(".")
+        and name not in {SECONDARY_NAMES_FILE, ACCESSION_MAP_FILE}
+    )
+
+
+def _entry_version(entry: Dict[str, Any]) -> str:
+    """Return a comparable version marker for ``entry``.
+
+    The ``entryAudit.entryVersion`` number is used when present, otherwise
+    the last annotation update date.
+    """
+
+    audit = entry.get("entryAudit")
+    if not isinstance(audit, dict):
+        return ""
+    version = audit.get("entryVersion")
+    if version is not None:
+        return str(version)
+    return str(audit.get("lastAnnotationUpdateDate") or "")
+
+
+def refresh_cache(
+    data_dir: str = "uniprot", *, chunk_size: int = 100
+) -> List[Dict[str, str]]:
+    """Re-download cached entries that changed upstream.
+
+    The current entry version of every cached accession is queried in bulk
+    with :data:`VERSION_FIELDS`, and only entries whose version differs from
+    the cached ``entryAudit`` are downloaded again. Unreadable cache files
+    count as changed. Accessions that were merged into another entry are
+    re-downloaded too, so ``<uid>.json`` holds what UniProt now serves for
+    that accession. Obsolete accessions are reported but their files are
+    kept.
+
+    Parameters
+    ----------
+    data_dir:
+        UniProt cache directory.
+    chunk_size:
+        Number of accessions per bulk request.
+
+    Returns
+    -------
+    list of dict
+        One report row per changed accession with keys ``uniprot_id``,
+        ``status`` (``updated``, ``merged`` or ``obsolete``),
+        ``current_accession``, ``cached_version`` and ``current_version``.
+        Accessions whose version lookup failed are omitted.
+    """
+
+    accessions = _cached_accessions(data_dir)
+    cached_versions: Dict[str, str] = {}
+    cached_fields: Dict[str, str | None] = {}
+    for acc in accessions:
+        try:
+            cached = load_entry(os.path.join(data_dir, f"{acc}.json"))
+            cached_versions[acc] = _entry_version(cached)
+            cached_fields[acc] = cached.get(FIELDS_MARKER)
+        except (OSError, json.JSONDecodeError, AttributeError):
+            cached_versions[acc] = ""
+            cached_fields[acc] = None
+
+    current = fetch_uniprot_batch(accessions, chunk_size=chunk_size, fields=VERSION_FIELDS)
+    report: List[Dict[str, str]] = []
+    for acc in accessions:
+        if acc not in current:
+            continue
+        entry = current[acc]
+        row = {
+            "uniprot_id": acc,
+            "status": "",
+            "current_accession": str(entry.get("primaryAccession") or ""),
+            "cached_version": cached_versions[acc],
+            "current_version": _entry_version(entry),
+        }
+        if not entry or entry.get("entryType") == "Inactive":
+            reason = entry.get("inactiveReason") or {}
+            targets = reason.get("mergeDemergeTo") or []
+            if targets:
+                row["status"] = "merged"
+                row["current_accession"] = "|".join(targets)
+            else:
+                row["status"] = "obsolete"
+                row["current_accession"] = ""
+        elif row["current_accession"] != acc:
+            row["status"] = "merged"
+        elif row["current_version"] != row["cached_version"] or not row["cached_version"]:
+            row["status"] = "updated"
+        else:
+            continue
+        report.append(row)
+
+    stale = [
+        row["uniprot_id"]
+        for row in report
+        if row["status"] == "updated"
+        or (row["status"] == "merged" and "|" not in row["current_accession"])
+    ]
+    # Projected entries are re-downloaded with the projection they had.
+    by_fields: Dict[str | None, List[str]] = {}
+    for acc in stale:
+        by_fields.setdefault(cached_fields[acc], []).append(acc)
+    for fields, group in by_fields.items():
+        for acc, entry in fetch_uniprot_batch(group, chunk_size=chunk_size, fields=fields).items():
+            if not entry:
+                continue
+            if fields:
+                entry[FIELDS_MARKER] = fields
+            try:
+                _write_json_atomic(os.path.join(data_dir, f"{acc}.json"), entry)
+            except OSError as exc:  # pragma: no cover - disk I/O failure
+                logger.warning("unable to write UniProt JSON for %s: %s", acc, exc)
+    counts = {
+        status: sum(row["status"] == status for row in report)
+        for status in ("updated", "merged", "obsolete")
+    }
+    logger.info(
+        "refreshed %d cached entries: %d updated, %d merged, %d obsolete",
+        len(accessions),
+        counts["updated"],
+        counts["merged"],
+        counts["obsolete"],
+    )
+    return report
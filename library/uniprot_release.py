@@ -0,0 +1,310 @@
+"""Offline access to UniProt entries stored in a local release file.
+
+UniProt distributes complete releases as large dumps.  This module serves
+individual entries from such a dump without loading it into memory: a one
+off scan builds an SQLite index mapping every primary and secondary
+accession to the byte range of its entry, after which each lookup is a
+single indexed query followed by a seek and a read.  Lookup latency
+therefore does not depend on the size of the release.
+
+The release must contain one JSON entry per line (the structure returned
+by ``rest.uniprot.org/uniprotkb/<id>.json``).  Compressed releases are
+supported when they consist of many gzip members, such as files produced
+by ``bgzip``; the index records the offset of each member so a lookup only
+decompresses the members holding the requested entry.  A conventional
+single-member gzip file is still readable but every lookup has to
+decompress from the start of the file, so recompress large releases with
+``bgzip`` before use.
+
+Example
+-------
+>>> with UniProtRelease("uniprot_sprot.jsonl.gz") as release:
+...     entry = release.get("Q99558")
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import re
+import sqlite3
+import zlib
+from typing import Any, Dict, Iterator, List, Tuple
+
+from . import json_library as _jl
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["UniProtRelease", "build_index"]
+
+# Accessions are located with regular expressions rather than by decoding
+# every line, which keeps indexing of very large releases fast.
+_PRIMARY_RE = re.compile(rb'"primaryAccession"\s*:\s*"([^"]+)"')
+_SECONDARY_RE = re.compile(rb'"secondaryAccessions"\s*:\s*\[([^\]]*)\]')
+_QUOTED_RE = re.compile(rb'"([^"]+)"')
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_READ_SIZE = 1 << 20
+# bgzip blocks hold at most 64 KiB, so lookups read compressed data in
+# similar steps instead of inflating megabytes per entry.
+_LOOKUP_READ_SIZE = 1 << 16
+
+
+def _is_gzip(path: str) -> bool:
+    with open(path, "rb") as handle:
+        return handle.read(2) == _GZIP_MAGIC
+
+
+def _iter_members(path: str) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(raw_offset, data)`` for each gzip member of ``path``.
+
+    Members are yielded piecewise: ``raw_offset`` is the compressed offset
+    of the member a piece belongs to, repeated for every piece of it.
+    """
+
+    with open(path, "rb") as handle:
+        member_start = 0
+        consumed = 0
+        decomp = zlib.decompressobj(wbits=31)
+        pending = b""
+        while True:
+            chunk = pending or handle.read(_READ_SIZE)
+            pending = b""
+            if not chunk:
+                break
+            data = decomp.decompress(chunk)
+            if data:
+                yield member_start, data
+            if decomp.eof:
+                # The unused tail starts the next member.
+                tail = decomp.unused_data
+                consumed += len(chunk) - len(tail)
+                member_start = consumed
+                decomp = zlib.decompressobj(wbits=31)
+                pending = tail
+            else:
+                consumed += len(chunk)
+
+
+def _iter_lines(path: str) -> Iterator[Tuple[int, bytes]]:
+    """Yield ``(offset, line)`` pairs of the uncompressed release."""
+
+    with open(path, "rb") as handle:
+        offset = 0
+        for line in handle:
+            yield offset, line
+            offset += len(line)
+
+
+def build_index(release_path: str, index_path: str | None = None) -> str:
+    """Scan ``release_path`` and write its accession index.
+
+    Parameters
+    ----------
+    release_path:
+        JSON-lines release file, optionally gzip or bgzip compressed.
+    index_path:
+        Destination of the SQLite index. Defaults to ``<release>.idx``.
+
+    Returns
+    -------
+    str
+        Path of the written index.
+    """
+
+    index_path = index_path or f"{release_path}.idx"
+    tmp_path = f"{index_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.execute(
+        "CREATE TABLE entries (accession TEXT PRIMARY KEY, offset INTEGER, "
+        "length INTEGER, is_primary INTEGER)"
+    )
+    conn.execute("CREATE TABLE members (raw_offset INTEGER, offset INTEGER)")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    rows: List[Tuple[str, int, int, int]] = []
+
+    def _add(offset: int, line: bytes) -> None:
+        match = _PRIMARY_RE.search(line)
+        if not match:
+            return
+        rows.append((match.group(1).decode(), offset, len(line), 1))
+        secondary = _SECONDARY_RE.search(line)
+        if secondary:
+            for acc in _QUOTED_RE.findall(secondary.group(1)):
+                rows.append((acc.decode(), offset, len(line), 0))
+        if len(rows) >= 100_000:
+            _flush()
+
+    def _flush() -> None:
+        # Primary accessions win over identical secondary ones.
+        conn.executemany(
+            "INSERT INTO entries VALUES (?, ?, ?, ?) ON CONFLICT(accession) DO UPDATE "
+            "SET offset = excluded.offset, length = excluded.length, "
+            "is_primary = 1 WHERE excluded.is_primary = 1",
+            rows,
+        )
+        rows.clear()
+
+    compressed = _is_gzip(release_path)
+    if compressed:
+        position = 0
+        last_member = -1
+        buffer = b""
+        buffer_start = 0
+        members: List[Tuple[int, int]] = []
+        for raw_offset, data in _iter_members(release_path):
+            if raw_offset != last_member:
+                members.append((raw_offset, position))
+                last_member = raw_offset
+            position += len(data)
+            buffer += data
+            start = 0
+            while True:
+                end = buffer.find(b"\n", start)
+                if end < 0:
+                    break
+                _add(buffer_start + start, buffer[start : end + 1])
+                start = end + 1
+            buffer_start += start
+            buffer = buffer[start:]
+        if buffer:
+            _add(buffer_start, buffer)
+        conn.executemany("INSERT INTO members VALUES (?, ?)", members)
+    else:
+        for offset, line in _iter_lines(release_path):
+            _add(offset, line)
+    _flush()
+    stat = os.stat(release_path)
+    conn.executemany(
+        "INSERT INTO meta VALUES (?, ?)",
+        [
+            ("compressed", str(int(compressed))),
+            ("size", str(stat.st_size)),
+            ("mtime", str(int(stat.st_mtime))),
+        ],
+    )
+    conn.commit()
+    count = conn.execute("SELECT COUNT(*) FROM entries WHERE is_primary = 1").fetchone()[0]
+    conn.close()
+    os.replace(tmp_path, index_path)
+    logger.info("indexed %d UniProt entries from %s", count, release_path)
+    return index_path
+
+
+class UniProtRelease:
+    """Random access to entries of a local UniProt release file.
+
+    Parameters
+    ----------
+    release_path:
+        JSON-lines release file, optionally gzip or bgzip compressed.
+    index_path:
+        SQLite index written by :func:`build_index`. Defaults to
+        ``<release>.idx``. A missing or outdated index is rebuilt.
+    """
+
+    def __init__(self, release_path: str, index_path: str | None = None) -> None:
+        self.release_path = str(release_path)
+        self.index_path = str(index_path or f"{self.release_path}.idx")
+        if not self._index_is_current():
+            build_index(self.release_path, self.index_path)
+        # Lookups may come from prefetch worker threads.
+        self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self._compressed = meta.get("compressed") == "1"
+        members = self._conn.execute(
+            "SELECT raw_offset, offset FROM members ORDER BY offset"
+        ).fetchall()
+        self._member_raw = [m[0] for m in members]
+        self._member_offsets = [m[1] for m in members]
+        if self._compressed and len(members) == 1:
+            logger.warning(
+                "%s is a single gzip member; lookups decompress from the start. "
+                "Recompress it with bgzip for random access.",
+                self.release_path,
+            )
+
+    def _index_is_current(self) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            conn = sqlite3.connect(self.index_path)
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+            finally:
+                conn.close()
+        except sqlite3.DatabaseError:
+            return False
+        stat = os.stat(self.release_path)
+        return meta.get("size") == str(stat.st_size) and meta.get("mtime") == str(
+            int(stat.st_mtime)
+        )
+
+    def __enter__(self) -> "UniProtRelease":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the index database."""
+
+        self._conn.close()
+
+    def __contains__(self, accession: str) -> bool:
+        return self._locate(accession) is not None
+
+    def _locate(self, accession: str) -> Tuple[int, int] | None:
+        row = self._conn.execute(
+            "SELECT offset, length FROM entries WHERE accession = ?", (accession,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _read(self, offset: int, length: int) -> bytes:
+        if not self._compressed:
+            with open(self.release_path, "rb") as handle:
+                handle.seek(offset)
+                return handle.read(length)
+        # Start at the member holding ``offset`` and decompress onwards until
+        # the whole entry is available.
+        pos = bisect.bisect_right(self._member_offsets, offset) - 1
+        raw_offset, start = self._member_raw[pos], self._member_offsets[pos]
+        needed = offset + length - start
+        out = bytearray()
+        with open(self.release_path, "rb") as handle:
+            handle.seek(raw_offset)
+            decomp = zlib.decompressobj(wbits=31)
+            chunk = b""
+            while len(out) < needed:
+                if not chunk:
+                    chunk = handle.read(_LOOKUP_READ_SIZE)
+                    if not chunk:
+                        break
+                out += decomp.decompress(chunk)
+                if decomp.eof:
+                    chunk = decomp.unused_data
+                    decomp = zlib.decompressobj(wbits=31)
+                else:
+                    chunk = b""
+        skip = offset - start
+        return bytes(out[skip : skip + length])
+
+    def get(self, accession: str) -> Dict[str, Any]:
+        """Return the entry for ``accession`` or an empty dictionary.
+
+        Secondary accessions resolve to the entry they belong to, matching
+        the redirect behaviour of the UniProt REST API.
+        """
+
+        location = self._locate(accession)
+        if location is None:
+            return {}
+        try:
+            return _jl.loads(self._read(*location))
+        except (OSError, ValueError) as exc:
+            logger.warning("unable to read %s from %s: %s", accession, self.release_path, exc)
+            return {}
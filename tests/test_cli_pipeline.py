@@ -9,10 +9,17 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 import get_target_data as gtd
 from library import chembl_library as cl
+from library import uniprot_library as uu
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data"
 
 
+def _parse_args(*argv: object) -> argparse.Namespace:
+    """Parse ``argv`` with the CLI parser so every option has its default."""
+
+    return gtd.build_parser().parse_args([str(arg) for arg in argv])
+
+
 def _sample_chembl_df() -> pd.DataFrame:
     return pd.DataFrame(
         {
@@ -38,13 +45,7 @@ def test_run_chembl(monkeypatch, tmp_path: Path) -> None:
     input_csv = tmp_path / "targets.csv"
     input_csv.write_text("chembl_id\nCHEMBL1075024\n", encoding="utf8")
     output_csv = tmp_path / "chembl.csv"
-    args = argparse.Namespace(
-        input_csv=input_csv,
-        output_csv=output_csv,
-        column="chembl_id",
-        sep=",",
-        encoding="utf8",
-    )
+    args = _parse_args("chembl", input_csv, output_csv)
     assert gtd.run_chembl(args) == 0
     df = pd.read_csv(output_csv, dtype=str)
     assert df.loc[0, "uniprot_id"] == "Q99558"
@@ -54,12 +55,8 @@ def test_run_uniprot(tmp_path: Path) -> None:
     input_csv = tmp_path / "uids.csv"
     input_csv.write_text("uniprot_id\nQ99558\n", encoding="utf8")
     output_csv = tmp_path / "uniprot.csv"
-    args = argparse.Namespace(
-        input_csv=input_csv,
-        output_csv=output_csv,
-        data_dir=DATA_DIR / "uniprot",
-        sep=",",
-        encoding="utf8",
+    args = _parse_args(
+        "uniprot", input_csv, output_csv, "--data-dir", DATA_DIR / "uniprot"
     )
     assert gtd.run_uniprot(args) == 0
     df = pd.read_csv(output_csv, dtype=str)
@@ -70,13 +67,14 @@ def test_run_iuphar(tmp_path: Path) -> None:
     input_csv = tmp_path / "uids.csv"
     input_csv.write_text("uniprot_id\nQ99558\n", encoding="utf8")
     output_csv = tmp_path / "iuphar.csv"
-    args = argparse.Namespace(
-        input_csv=input_csv,
-        output_csv=output_csv,
-        target_csv=DATA_DIR / "_IUPHAR_target.csv",
-        family_csv=DATA_DIR / "_IUPHAR_family.csv",
-        sep=",",
-        encoding="utf8",
+    args = _parse_args(
+        "iuphar",
+        input_csv,
+        output_csv,
+        "--target-csv",
+        DATA_DIR / "_IUPHAR_target.csv",
+        "--family-csv",
+        DATA_DIR / "_IUPHAR_family.csv",
     )
     assert gtd.run_iuphar(args) == 0
     df = pd.read_csv(output_csv, dtype=str)
@@ -88,17 +86,16 @@ def test_run_all(monkeypatch, tmp_path: Path) -> None:
     input_csv = tmp_path / "chembl_ids.csv"
     input_csv.write_text("chembl_id\nCHEMBL1075024\n", encoding="utf8")
     output_csv = tmp_path / "merged.csv"
-    args = argparse.Namespace(
-        input_csv=input_csv,
-        output_csv=output_csv,
-        chembl_out=None,
-        uniprot_out=None,
-        iuphar_out=None,
-        data_dir=DATA_DIR / "uniprot",
-        target_csv=DATA_DIR / "_IUPHAR_target.csv",
-        family_csv=DATA_DIR / "_IUPHAR_family.csv",
-        sep=",",
-        encoding="utf8",
+    args = _parse_args(
+        "all",
+        input_csv,
+        output_csv,
+        "--data-dir",
+        DATA_DIR / "uniprot",
+        "--target-csv",
+        DATA_DIR / "_IUPHAR_target.csv",
+        "--family-csv",
+        DATA_DIR / "_IUPHAR_family.csv",
     )
     assert gtd.run_all(args) == 0
     df = pd.read_csv(output_csv, dtype=str)
@@ -106,3 +103,55 @@ def test_run_all(monkeypatch, tmp_path: Path) -> None:
     assert df.loc[0, "uniprot_id"] == "Q99558"
     assert df.loc[0, "target_id"] == "2074"
     assert df.loc[0, "IUPHAR_family_id"] == "0624"
+
+
+def test_run_all_hands_off_in_memory(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(cl, "get_targets", lambda ids: _sample_chembl_df())
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", lambda accessions, **kw: {})
+    target_csv = tmp_path / "target.csv"
+    target_csv.write_text(
+        "target_id,swissprot,hgnc_name,hgnc_id,gene_name,synonyms,family_id,target_name,type\n"
+        "2074,Q99558,MAP3K14,6853,MAP3K14,NIK,0624,NIK,Enzyme.Transferase\n",
+        encoding="utf8",
+    )
+    family_csv = tmp_path / "family.csv"
+    family_csv.write_text(
+        "family_id,family_name,parent_family_id,target_id,type\n"
+        "0624,MAP3K,,2074,Enzyme.Transferase\n",
+        encoding="utf8",
+    )
+    input_csv = tmp_path / "chembl_ids.csv"
+    input_csv.write_text("chembl_id\nCHEMBL1075024\n", encoding="utf8")
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    args = _parse_args(
+        "all",
+        input_csv,
+        out_dir / "merged.csv",
+        "--data-dir",
+        DATA_DIR / "uniprot",
+        "--target-csv",
+        target_csv,
+        "--family-csv",
+        family_csv,
+    )
+    assert gtd.run_all(args) == 0
+    assert [p.name for p in out_dir.iterdir()] == ["merged.csv"]
+    df = pd.read_csv(args.output_csv, dtype=str)
+    assert len(df) == 1
+    assert df.loc[0, "chembl_id"] == "CHEMBL1075024"
+    assert df.loc[0, "genus"] == "Homo"
+    assert df.loc[0, "target_id"] == "2074"
+    assert df.loc[0, "IUPHAR_family_id"] == "0624"
+
+    args.chembl_out = out_dir / "chembl.csv"
+    args.uniprot_out = out_dir / "uniprot.csv"
+    args.iuphar_out = out_dir / "iuphar.csv"
+    assert gtd.run_all(args) == 0
+    chembl = pd.read_csv(args.chembl_out, dtype=str)
+    assert chembl.loc[0, "target_chembl_id"] == "CHEMBL1075024"
+    uniprot = pd.read_csv(args.uniprot_out, dtype=str)
+    assert list(uniprot["uniprot_id"]) == ["Q99558"]
+    iuphar = pd.read_csv(args.iuphar_out, dtype=str)
+    assert iuphar.loc[0, "target_id"] == "2074"
+    pd.testing.assert_frame_equal(pd.read_csv(args.output_csv, dtype=str), df)
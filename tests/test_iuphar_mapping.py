@@ -1,11 +1,91 @@
+from __future__ import annotations
+
 from pathlib import Path
+import dataclasses
+import json
+import pickle
 import sys
+import threading
+from typing import Any, Callable
 
 import pandas as pd
+import pytest
+import requests
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from library.iuphar_library import IUPHARData
+from library import iuphar_library as il
+from library.iuphar_library import (
+    CLASSIFICATION_COLUMNS,
+    ClassificationRecord,
+    IUPHARClassifier,
+    IUPHARData,
+)
+
+
+# Columns of empty IUPHAR tables used where a test needs only the other one.
+TARGET_COLUMNS = ["target_id", "uniprot_id", "hgnc_name", "hgnc_id", "gene_name", "synonyms"]
+FAMILY_COLUMNS = ["family_id", "family_name", "parent_family_id", "target_id", "type"]
+
+
+@pytest.fixture
+def iuphar_data() -> IUPHARData:
+    """Two targets: a kinase under an enzyme family and an ion channel."""
+
+    target_df = pd.DataFrame(
+        {
+            "target_id": ["0001", "0002"],
+            "uniprot_id": ["Q12345", "Q67890"],
+            "hgnc_name": ["", ""],
+            "hgnc_id": ["", ""],
+            "gene_name": ["", ""],
+            "synonyms": ["MAP kinase", "Calcium channel"],
+            "family_id": ["100", "200"],
+            "type": ["Enzyme.Transferase", "Ion channel.Other ion channel"],
+        }
+    )
+    family_df = pd.DataFrame(
+        {
+            "family_id": ["100", "200", "300"],
+            "family_name": ["Kinases", "Channels", "Enzyme"],
+            "parent_family_id": ["300", "", ""],
+            "target_id": ["0001", "0002", ""],
+            "type": ["Enzyme.Transferase", "Ion channel.Other ion channel", ""],
+        }
+    )
+    return IUPHARData(target_df=target_df, family_df=family_df)
+
+
+class FakeResponse:
+    """Minimal stand-in for :class:`requests.Response`."""
+
+    def __init__(
+        self, status_code: int = 200, content: bytes = b"", headers: dict | None = None
+    ) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+
+class FakeSession:
+    """Record ``get`` calls and answer them with ``handler(url, **kwargs)``."""
+
+    def __init__(self, handler: Callable[..., FakeResponse]) -> None:
+        self.handler = handler
+        self.calls: list[tuple[str, dict]] = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, **kwargs: Any) -> FakeResponse:
+        with self._lock:
+            self.calls.append((url, kwargs))
+        return self.handler(url, **kwargs)
 
 
 def test_map_uniprot_file(tmp_path: Path) -> None:
@@ -38,3 +118,407 @@ def test_map_uniprot_file(tmp_path: Path) -> None:
     out_df = pd.read_csv(output_csv, sep=";", dtype=str)
     assert list(out_df["target_id"]) == ["0001", "0001"]
     assert list(df["target_id"]) == ["0001", "0001"]
+
+
+def test_indexed_lookups_match_table(tmp_path: Path) -> None:
+    target_csv = tmp_path / "target.csv"
+    family_csv = tmp_path / "family.csv"
+    target_csv.write_text(
+        "target_id,swissprot,hgnc_name,hgnc_id,gene_name,synonyms,family_id,target_name,type\n"
+        "0001,Q12345,GeneX,1,GENE1,Syn1,100,TargetX,Enzyme.Lyase\n"
+        "0002,Q12345,GeneX,2,GENE2,Syn2,101,TargetY,\n"
+        "0001,Q54321,GeneZ,3,GENE3,Syn3,102,Duplicate,\n",
+        encoding="utf-8",
+    )
+    family_csv.write_text(
+        "family_id,family_name,parent_family_id,target_id,type\n"
+        "100,FamilyX,200,0001,Enzyme.Lyase\n"
+        "101,FamilyY,200,0002|0003,Enzyme.Lyase\n"
+        "200,Enzyme,,,Enzyme\n",
+        encoding="utf-8",
+    )
+
+    data = IUPHARData.from_files(target_csv, family_csv)
+    assert data.target_id_by_uniprot("Q12345") == "0001"
+    assert data.target_id_by_hgnc_name("GeneX") == "0001|0002"
+    assert data.target_id_by_hgnc_id("3") == "0001"
+    assert data.target_id_by_gene("GENE9") == ""
+    assert data.from_target_name("0001") == "TargetX"
+    assert data.from_target_parent_family("0003") == "200"
+    assert data.family_chain("101") == ["101", "200"]
+
+    data.target_df.loc[1, "uniprot_id"] = "P00001"
+    data.build_indexes()
+    assert data.target_id_by_uniprot("P00001") == "0002"
+
+
+def test_family_closure_handles_cycles() -> None:
+    family_df = pd.DataFrame(
+        {
+            "family_id": ["A", "B", "C", "D"],
+            "family_name": ["Alpha", "Beta", "Enzyme", "Delta"],
+            "parent_family_id": ["B", "A", "A", "X"],
+            "target_id": ["", "", "", ""],
+            "type": ["", "", "", ""],
+        }
+    )
+    target_df = pd.DataFrame(columns=TARGET_COLUMNS)
+    data = IUPHARData(target_df=target_df, family_df=family_df)
+    assert data.family_chain("A") == ["A", "B"]
+    assert data.family_chain("B") == ["B", "A"]
+    assert data.family_chain("C") == ["C", "A", "B"]
+    assert data.family_chain("D") == ["D", "X"]
+    assert data.family_chain("Z") == ["Z"]
+    assert data.family_name_path("C") == ["Alpha", "Beta"]
+    assert data.family_depth("C") == 2
+    assert data.family_depth("X") == 0
+
+
+def test_target_id_by_name_matches_substring_scan() -> None:
+    target_df = pd.DataFrame(
+        {
+            "target_id": ["1", "2", "3", "2"],
+            "uniprot_id": ["", "", "", ""],
+            "hgnc_name": ["", "", "", ""],
+            "hgnc_id": ["", "", "", ""],
+            "gene_name": ["", "", "", ""],
+            "synonyms": ["MAP kinase|NIK", "map3k14", "Na+ channel (beta)", "NIKE"],
+            "family_id": ["10", "20", "30", "20"],
+        }
+    )
+    family_df = pd.DataFrame(columns=FAMILY_COLUMNS)
+    data = IUPHARData(target_df=target_df, family_df=family_df)
+    for name in ["nik", "MAP", "k", "(beta)", "a+ c", "missing", "KINASE|NIK"]:
+        mask = target_df["synonyms"].str.contains(name, case=False, regex=False)
+        expected = "|".join(dict.fromkeys(target_df.loc[mask, "target_id"]))
+        assert data.target_id_by_name(name) == expected
+    assert data.target_ids_by_synonyms(["map3k", "channel", "nik"]) == "2|3"
+    assert data.family_id_by_name("nik") == "10|20"
+
+
+def test_map_uniprot_file_cascade(tmp_path: Path) -> None:
+    target_csv = tmp_path / "target.csv"
+    family_csv = tmp_path / "family.csv"
+    target_csv.write_text(
+        "target_id,swissprot,hgnc_name,hgnc_id,gene_name,synonyms,family_id,target_name,type\n"
+        "0001,Q12345,GeneX,1,GENE1,Syn alpha,100,TargetX,Enzyme.Lyase\n"
+        "0002,Q67890,GeneY,2,GENE2,Syn beta,100,TargetY,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+    family_csv.write_text(
+        "family_id,family_name,parent_family_id,target_id,type\n"
+        "100,FamilyX,,0001|0002,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        "uniprot_id,hgnc_name,gene_name,synonyms,ec_number\n"
+        "Q12345,,,,\n"
+        "P1,GeneY,,,\n"
+        "P2,,GENE1,,\n"
+        "P3,,,Syn beta,\n"
+        "P4,,,,2.7.11.1\n"
+        "P5,,,,\n",
+        encoding="utf-8",
+    )
+    data = IUPHARData.from_files(target_csv, family_csv)
+    df = data.map_uniprot_file(input_csv, tmp_path / "out.csv")
+    assert list(df["target_id"]) == ["0001", "0002", "0001", "0002", "", ""]
+    assert list(df["IUPHAR_family_id"]) == ["100"] * 4 + ["N/A", ""]
+    assert df.loc[4, "IUPHAR_type"] == "Enzyme.Transferase"
+    assert list(df["full_name_path"][:2]) == ["TargetX#FamilyX", "TargetY#FamilyX"]
+
+    input_csv.write_text("uniprot_id\n", encoding="utf-8")
+    empty = data.map_uniprot_file(input_csv, tmp_path / "empty.csv")
+    assert empty.empty and "IUPHAR_chain" in empty.columns
+
+
+def test_map_uniprot_df_matches_file(tmp_path: Path) -> None:
+    target_csv = tmp_path / "target.csv"
+    family_csv = tmp_path / "family.csv"
+    target_csv.write_text(
+        "target_id,swissprot,hgnc_name,hgnc_id,gene_name,synonyms,family_id,target_name,type\n"
+        "0001,Q12345,GeneX,1,GENE1,Syn alpha,100,TargetX,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+    family_csv.write_text(
+        "family_id,family_name,parent_family_id,target_id,type\n"
+        "100,FamilyX,,0001,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+    frame = pd.DataFrame(
+        {
+            "uniprot_id": ["Q12345", "P1", "P2"],
+            "gene_name": [None, "GENE1", None],
+            "ec_number": ["", None, "2.7.11.1"],
+            "genus": pd.Categorical(["Homo", None, "Homo"]),
+            "transmembrane": [True, False, True],
+        },
+        index=[10, 11, 12],
+    )
+    input_csv = tmp_path / "input.csv"
+    frame.to_csv(input_csv, index=False)
+    data = IUPHARData.from_files(target_csv, family_csv)
+
+    df = data.map_uniprot_df(frame)
+    from_file = data.map_uniprot_file(input_csv, tmp_path / "out.csv")
+    assert list(df.index) == [10, 11, 12]
+    assert list(df["target_id"]) == ["0001", "0001", ""]
+    assert df.loc[12, "IUPHAR_type"] == "Enzyme.Transferase"
+    pd.testing.assert_frame_equal(
+        df.drop(columns="transmembrane").reset_index(drop=True),
+        from_file.drop(columns="transmembrane"),
+    )
+    assert frame["gene_name"].isna().sum() == 2
+
+
+def test_from_files_reuses_compiled_index(tmp_path: Path, monkeypatch) -> None:
+    target_csv = tmp_path / "target.csv"
+    family_csv = tmp_path / "family.csv"
+    target_csv.write_text(
+        "target_id,swissprot,hgnc_name,hgnc_id,gene_name,synonyms,family_id,target_name,type\n"
+        "0001,Q12345,GeneX,1,GENE1,Syn1|Syn2,100,TargetX,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+    family_csv.write_text(
+        "family_id,family_name,parent_family_id,target_id,type\n"
+        "100,FamilyX,,0001,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+    first = IUPHARData.from_files(target_csv, family_csv)
+    assert (tmp_path / "target.csv.index.pkl").exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sources parsed again")
+
+    monkeypatch.setattr(il, "load_targets", fail)
+    cached = IUPHARData.from_files(target_csv, family_csv)
+    assert cached.target_df.equals(first.target_df)
+    assert cached.target_id_by_name("syn2") == "0001"
+    assert cached.family_chain("100") == ["100"]
+
+    monkeypatch.undo()
+    target_csv.write_text(
+        target_csv.read_text(encoding="utf-8").replace("Q12345", "P99999"),
+        encoding="utf-8",
+    )
+    refreshed = IUPHARData.from_files(target_csv, family_csv)
+    assert refreshed.target_id_by_uniprot("P99999") == "0001"
+
+
+def test_from_files_survives_unpicklable_index(tmp_path: Path, monkeypatch, caplog) -> None:
+    target_csv = tmp_path / "target.csv"
+    family_csv = tmp_path / "family.csv"
+    target_csv.write_text(
+        "target_id,swissprot,hgnc_name,hgnc_id,gene_name,synonyms,family_id,target_name,type\n"
+        "0001,Q12345,GeneX,1,GENE1,Syn1|Syn2,100,TargetX,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+    family_csv.write_text(
+        "family_id,family_name,parent_family_id,target_id,type\n"
+        "100,FamilyX,,0001,Enzyme.Lyase\n",
+        encoding="utf-8",
+    )
+
+    def fail(*args, **kwargs):
+        raise pickle.PicklingError("cannot pickle")
+
+    monkeypatch.setattr(il.pickle, "dumps", fail)
+    data = IUPHARData.from_files(target_csv, family_csv)
+    assert data.target_id_by_uniprot("Q12345") == "0001"
+    assert "unable to write IUPHAR index" in caplog.text
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["family.csv", "target.csv"]
+
+
+def test_classifier_memoises_immutable_records(iuphar_data: IUPHARData) -> None:
+    classifier = IUPHARClassifier(iuphar_data)
+    record = classifier.by_target_id("0001")
+    assert record.IUPHAR_tree == ("100", "300")
+    assert record.IUPHAR_type == "Enzyme.Transferase"
+    assert classifier.by_target_id("0001") is record
+    assert classifier.by_ec_number("2.7.11.1") is classifier.by_ec_number("2.7.11.1")
+    assert classifier.set_record("0001", "", "", ec_numbers=["1.1.1.1"]).IUPHAR_ecNumber == (
+        "1.1.1.1",
+    )
+    assert classifier.cache_info()["by_target_id"].hits == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.IUPHAR_type = "Other"
+    assert not hasattr(record, "__dict__")
+    assert ClassificationRecord(IUPHAR_tree=["a", "b"]).IUPHAR_tree == ("a", "b")
+
+    classifier.clear_cache()
+    assert classifier.cache_info() == {}
+    assert classifier.by_target_id("0001") == record
+
+
+def test_classify_many_matches_get(iuphar_data: IUPHARData) -> None:
+    classifier = IUPHARClassifier(iuphar_data)
+    rows = [
+        ("0001", "", "", "kinase"),
+        ("0001|0002", "200", "", ""),
+        ("", "1|2", "2.7.11.1", "name"),
+        ("N/A", "", "abc", "channel"),
+        ("", "", "", ""),
+        ("0001", "", "", "kinase"),
+    ]
+    target_ids = pd.Series([r[0] for r in rows], index=list("abcdef"))
+    result = classifier.classify_many(
+        target_ids, [r[1] for r in rows], [r[2] for r in rows], [r[3] for r in rows]
+    )
+    assert list(result.columns) == list(CLASSIFICATION_COLUMNS)
+    assert list(result.index) == list("abcdef")
+    assert list(result["STATUS"]) == [
+        "target_id",
+        "family_id",
+        "ec_number",
+        "name",
+        "N/A",
+        "target_id",
+    ]
+    for row, (_, got) in zip(rows, result.iterrows()):
+        record = classifier.get(*row)
+        assert got["IUPHAR_type"] == record.IUPHAR_type
+        assert got["IUPHAR_chain"] == ">".join(record.IUPHAR_tree)
+        assert got["IUPHAR_ecNumber"] == "|".join(record.IUPHAR_ecNumber)
+
+    functions = classifier.classify_many(["", ""], functions=["Kinase activity", ""])
+    assert list(functions["STATUS"]) == ["molecular_function", "N/A"]
+    assert classifier.classify_many([]).empty
+
+
+def test_get_short_circuits_and_records_stage_stats(
+    monkeypatch, iuphar_data: IUPHARData
+) -> None:
+    classifier = IUPHARClassifier(iuphar_data)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("later stage evaluated")
+
+    monkeypatch.setattr(classifier, "by_name", fail)
+    assert classifier.get("0001", "", "2.7.11.1", "kinase").STATUS == "target_id"
+    monkeypatch.undo()
+    assert classifier.get("", "", "abc", "kinase").STATUS == "name"
+
+    stats = classifier.stage_stats()
+    assert set(stats) == {"target_id", "ec_number", "name"}
+    assert (stats["ec_number"].calls, stats["ec_number"].hits) == (1, 0)
+    assert stats["name"].hits == 1 and stats["name"].seconds >= 0
+    classifier.reset_stage_stats()
+    assert classifier.stage_stats() == {}
+
+
+def test_iuphar_upload_uses_revalidated_mirror(tmp_path: Path) -> None:
+    files = {
+        il.IUPHAR_UNIPROT_MAPPING: b'"UniProtKB ID","GtoPdb IUPHAR ID","IUPHAR ID"\nQ12345,0001,0001\n',
+        il.IUPHAR_HGNC_MAPPING: b'"HGNC ID","IUPHAR ID"\n1,0001\n',
+    }
+
+    def serve(url: str, headers: dict, timeout: float) -> FakeResponse:
+        assert timeout > 0
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, files[url.rsplit("/", 1)[1]], {"ETag": '"v1"'})
+
+    def unreachable(url: str, headers: dict, timeout: float) -> FakeResponse:
+        raise requests.ConnectionError("offline")
+
+    target_df = pd.DataFrame(
+        {
+            "target_id": ["0001"],
+            "uniprot_id": ["Q12345"],
+            "hgnc_name": [""],
+            "hgnc_id": ["1"],
+            "gene_name": [""],
+            "synonyms": [""],
+            "family_id": ["100"],
+        }
+    )
+    family_df = pd.DataFrame(
+        {
+            "family_id": ["100"],
+            "family_name": ["FamilyX"],
+            "parent_family_id": [""],
+            "target_id": ["0001"],
+            "type": [""],
+        }
+    )
+    data = IUPHARData(target_df=target_df, family_df=family_df)
+    mirror = tmp_path / "mirror"
+
+    with pytest.raises(FileNotFoundError):
+        data.iuphar_upload(mirror, offline=True)
+    server = FakeSession(serve)
+    first = data.iuphar_upload(mirror, session=server)
+    assert (mirror / il.IUPHAR_UNIPROT_MAPPING).read_bytes() == files[il.IUPHAR_UNIPROT_MAPPING]
+    assert first.loc[0, "family_name"] == "FamilyX"
+
+    second = data.iuphar_upload(mirror, session=server)
+    etags = [kwargs["headers"].get("If-None-Match") for _, kwargs in server.calls]
+    assert etags == [None, None, '"v1"', '"v1"']
+    server.handler = unreachable
+    assert data.iuphar_upload(mirror, session=server).equals(second)
+    assert data.iuphar_upload(mirror, offline=True).equals(first)
+
+
+def test_websearch_genes_caches_hits_and_misses(tmp_path: Path) -> None:
+    def search(url: str, params: dict, timeout: float) -> FakeResponse:
+        symbol = params["geneSymbol"]
+        if symbol == "BROKEN":
+            raise requests.ConnectionError("reset")
+        hits = [] if symbol == "NONE" else [{"targetId": len(symbol), "name": symbol}]
+        return FakeResponse(200, json.dumps(hits).encode())
+
+    data = IUPHARData(
+        target_df=pd.DataFrame(columns=TARGET_COLUMNS),
+        family_df=pd.DataFrame(columns=FAMILY_COLUMNS),
+    )
+    service = FakeSession(search)
+    symbols = ["ADRB2", "NONE", "BROKEN", "ADRB2", "", "DRD2"]
+    result = data.websearch_genes(symbols, tmp_path, session=service, rate=0)
+    assert result == {
+        "ADRB2": {"targetId": 5, "name": "ADRB2"},
+        "NONE": {},
+        "DRD2": {"targetId": 4, "name": "DRD2"},
+    }
+    queries = [kwargs["params"]["geneSymbol"] for _, kwargs in service.calls]
+    assert sorted(queries) == ["ADRB2", "BROKEN", "DRD2", "NONE"]
+
+    service.calls.clear()
+    again = data.websearch_genes(symbols, tmp_path, session=service, rate=0)
+    assert again == result
+    assert [kwargs["params"]["geneSymbol"] for _, kwargs in service.calls] == ["BROKEN"]
+
+
+def test_get_database_aggregates_modes() -> None:
+    target_df = pd.DataFrame(
+        {
+            "target_id": ["1", "2", "3"],
+            "uniprot_id": ["", "", ""],
+            "hgnc_name": ["", "", ""],
+            "hgnc_id": ["", "", ""],
+            "gene_name": ["", "", ""],
+            "synonyms": ["", "", ""],
+            "type": ["Enzyme.Lyase", "Receptor.Catalytic receptor", "Enzyme.Lyase"],
+        }
+    )
+    family_df = pd.DataFrame(columns=FAMILY_COLUMNS)
+    classifier = IUPHARClassifier(IUPHARData(target_df=target_df, family_df=family_df))
+    family_table = pd.DataFrame(
+        {
+            "task_uniprot_id": ["P1", "P2", "P3", "P4", "P5", "P6"],
+            "db": ["B", "A", "A", "A", "N/A", None],
+            "guidetopharmacology_family": [None, "F2", "F1", "F2", "F9", "F9"],
+        }
+    )
+    name_table = pd.DataFrame(
+        {
+            "task_uniprot_id": ["P1", "P2", "P3", "P4"],
+            "guidetopharmacology_id": ["9", "2", "1", "3"],
+        }
+    )
+    result = classifier.get_database(family_table, name_table, "db")
+    assert result.to_dict("list") == {
+        "db": ["A", "B"],
+        "guidetopharmacology_family": ["F2", ""],
+        "guidetopharmacology_type": ["Enzyme.Lyase", ""],
+    }
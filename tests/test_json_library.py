@@ -0,0 +1,61 @@
+from pathlib import Path
+import sys
+import json
+import pytest
+import requests
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from library import json_library as jl
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "uniprot"
+
+
+@pytest.fixture
+def restore_backend():
+    backend = jl.get_backend()
+    yield
+    jl.set_backend(backend)
+
+
+@pytest.mark.parametrize("backend", jl.available_backends())
+def test_backends_decode_identically(backend: str, restore_backend) -> None:
+    raw = (DATA_DIR / "Q99558.json").read_bytes()
+    jl.set_backend(backend)
+    assert jl.loads(raw) == json.loads(raw)
+    with pytest.raises(json.JSONDecodeError):
+        jl.loads(raw[: len(raw) // 2])
+
+
+def test_set_backend_rejects_unknown(restore_backend) -> None:
+    with pytest.raises(ValueError):
+        jl.set_backend("simplejson-missing")
+
+
+class FakeResponse:
+    content = b'{"results": [1, 2]}'
+
+    def json(self):
+        return {"from": "requests"}
+
+
+@pytest.mark.parametrize("backend", jl.available_backends())
+def test_response_json_decodes_body(backend: str, restore_backend) -> None:
+    jl.set_backend(backend)
+    expected = {"from": "requests"} if backend == "json" else {"results": [1, 2]}
+    assert jl.response_json(FakeResponse()) == expected
+
+
+class MalformedResponse:
+    content = b'{"results": [1,'
+
+    def json(self):
+        raise requests.exceptions.JSONDecodeError("Expecting value", "", 0)
+
+
+@pytest.mark.parametrize("backend", jl.available_backends())
+def test_response_json_raises_requests_error(backend: str, restore_backend) -> None:
+    jl.set_backend(backend)
+    with pytest.raises(requests.RequestException) as info:
+        jl.response_json(MalformedResponse())
+    assert isinstance(info.value, json.JSONDecodeError)
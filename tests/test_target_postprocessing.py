@@ -0,0 +1,75 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from library.target_postprocessing import (
+    _pipe_merge,
+    _pipe_merge_columns,
+    postprocess_file,
+    postprocess_targets,
+)
+
+
+def test_pipe_merge_columns_matches_row_merge() -> None:
+    df = pd.DataFrame(
+        {
+            "a": ["x| y |x", None, "", " | ", "b|a", np.nan, 5],
+            "b": ["y|z", "q", None, "", "a|c", "", "k| k"],
+        },
+        index=[10, 11, 12, 13, 14, 15, 16],
+    )
+    expected = df.apply(lambda r: _pipe_merge([r.get("a"), r.get("missing"), r.get("b")]), axis=1)
+    result = _pipe_merge_columns(df, ["a", "missing", "b"])
+    assert list(result) == ["x|y|z", "q", "", "", "b|a|c", "", "k"]
+    assert result.equals(expected)
+    assert list(_pipe_merge_columns(df, ["missing"])) == [""] * len(df)
+    assert _pipe_merge_columns(df.iloc[:0], ["a"]).empty
+
+
+def test_postprocess_targets_merges_tokens() -> None:
+    df = pd.DataFrame(
+        {
+            "uniProtkbId": ["ADRB2_HUMAN"],
+            "uniprot_id": ["P07550"],
+            "geneName": ["adrb2"],
+            "gene": ["ADRB2|ADRB2R"],
+            "names": ["Beta-2 adrenergic receptor | B2AR"],
+            "ec_number": [None],
+            "ec_code": ["3.1.1.1"],
+        }
+    )
+    row = postprocess_targets(df).iloc[0]
+    assert row["gene_name"] == "ADRB2"
+    assert row["synonyms"] == "adrb2|adrb2r|beta-2 adrenergic receptor|b2ar"
+    assert row["ec_number"] == "3.1.1.1"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_postprocess_file_chunked_matches_whole_file(tmp_path: Path, workers: int) -> None:
+    input_csv = tmp_path / "targets.csv"
+    pd.DataFrame(
+        {
+            "uniProtkbId": [f"P{i}_HUMAN" for i in range(25)],
+            "uniprot_id": [f"P{i}" for i in range(25)],
+            "geneName": ["" if i % 3 else f"g{i}" for i in range(25)],
+            "gene": [f"G{i}|G{i % 4}" for i in range(25)],
+            "names": [f"Name {i % 5} | alt" for i in range(25)],
+            "ec_code": ["" if i % 2 else "1.1.1.1" for i in range(25)],
+        }
+    ).to_csv(input_csv, sep=";", index=False)
+
+    whole = tmp_path / "whole.csv"
+    chunked = tmp_path / "chunked.csv"
+    postprocess_file(input_csv, whole, sep=";")
+    postprocess_file(input_csv, chunked, sep=";", chunksize=4, workers=workers)
+    assert chunked.read_bytes() == whole.read_bytes()
+
+    input_csv.write_text(input_csv.read_text().splitlines()[0] + "\n")
+    postprocess_file(input_csv, chunked, sep=";", chunksize=4)
+    assert chunked.read_text().count("\n") == 1
+    assert chunked.read_text().startswith("chembl_id;uniprotkb_Id")
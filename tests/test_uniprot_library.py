@@ -1,7 +1,9 @@
 from pathlib import Path
 import sys
 import json
+import threading
 import pandas as pd
+import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
@@ -50,3 +52,312 @@ def test_process_writes_expected(tmp_path: Path) -> None:
     df = pd.read_csv(output_csv, dtype=str)
     assert df.loc[0, "uniprot_id"] == "Q99558"
     assert "Mitogen-activated protein kinase kinase kinase 14" in df.loc[0, "names"]
+
+
+def test_load_entry_streaming_matches_full_decode() -> None:
+    pytest.importorskip("ijson")
+    path = str(DATA_DIR / "Q99558.json")
+    full = uu.load_entry(path)
+    partial = uu.load_entry(path, streaming=True)
+    assert "references" not in partial
+    assert "sequence" not in partial
+    assert all(set(feat) == {"type"} for feat in partial["features"])
+    assert uu.extract_names(partial) == uu.extract_names(full)
+    assert uu.extract_keywords(partial) == uu.extract_keywords(full)
+    assert uu.extract_crossrefs(partial) == uu.extract_crossrefs(full)
+    assert uu.extract_organism(partial) == uu.extract_organism(full)
+
+
+def test_process_resolves_secondary_names_in_bulk(tmp_path: Path, monkeypatch) -> None:
+    data_dir = tmp_path / "uniprot"
+    data_dir.mkdir()
+    (data_dir / "Q99558.json").write_text(
+        (DATA_DIR / "Q99558.json").read_text(encoding="utf8"), encoding="utf8"
+    )
+    calls: list[list[str]] = []
+
+    def fake_batch(accessions, **kwargs):
+        accessions = list(accessions)
+        calls.append(accessions)
+        return {
+            acc: {"proteinDescription": {"recommendedName": {"fullName": {"value": f"Name {acc}"}}}}
+            for acc in accessions
+        }
+
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", fake_batch)
+    input_csv = tmp_path / "uids.csv"
+    input_csv.write_text("uniprot_id\nQ99558\nQ99558\n", encoding="utf8")
+    output_csv = tmp_path / "out.csv"
+    uu.process(str(input_csv), str(output_csv), data_dir=str(data_dir))
+
+    assert calls == [["A8K2D8", "D3DX67", "Q8IYN1"]]
+    df = pd.read_csv(output_csv, dtype=str)
+    assert df.loc[1, "secondaryAccessionNames"] == "Name A8K2D8|Name D3DX67|Name Q8IYN1"
+    assert (data_dir / uu.SECONDARY_NAMES_FILE).exists()
+
+    uu.process(str(input_csv), str(output_csv), data_dir=str(data_dir))
+    assert len(calls) == 1
+
+
+def test_collect_info_reuses_parsed_secondary_names(tmp_path: Path, monkeypatch) -> None:
+    data_dir = tmp_path / "uniprot"
+    data_dir.mkdir()
+    (data_dir / "Q99558.json").write_text(
+        (DATA_DIR / "Q99558.json").read_text(encoding="utf8"), encoding="utf8"
+    )
+    index = data_dir / uu.SECONDARY_NAMES_FILE
+    index.write_text(
+        json.dumps({acc: [f"Name {acc}"] for acc in ("A8K2D8", "D3DX67", "Q8IYN1")}),
+        encoding="utf8",
+    )
+    parsed: list[str] = []
+    load = uu._jl.load
+
+    def counting_load(handle):
+        parsed.append(Path(handle.name).name)
+        return load(handle)
+
+    monkeypatch.setattr(uu._jl, "load", counting_load)
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", lambda accessions, **kw: {})
+    for _ in range(3):
+        info = uu.collect_info("Q99558", str(data_dir))
+        assert info["secondaryAccessionNames"] == "Name A8K2D8|Name D3DX67|Name Q8IYN1"
+    assert parsed.count(uu.SECONDARY_NAMES_FILE) == 1
+
+    index.write_text(json.dumps({"A8K2D8": ["Renamed"]}), encoding="utf8")
+    info = uu.collect_info("Q99558", str(data_dir))
+    assert info["secondaryAccessionNames"] == "Renamed"
+    assert parsed.count(uu.SECONDARY_NAMES_FILE) == 2
+
+
+def test_process_prefetches_missing_entries_in_order(tmp_path: Path, monkeypatch) -> None:
+    sample = json.loads((DATA_DIR / "Q99558.json").read_text(encoding="utf8"))
+    fetched: list[str] = []
+
+    def fake_fetch(uniprot_id: str) -> dict:
+        fetched.append(uniprot_id)
+        return dict(sample, primaryAccession=uniprot_id)
+
+    monkeypatch.setattr(uu, "fetch_uniprot", fake_fetch)
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", lambda accessions, **kw: {})
+    data_dir = tmp_path / "uniprot"
+    ids = ["P00001", "P00002", "P00001", "P00003"]
+    input_csv = tmp_path / "uids.csv"
+    input_csv.write_text("uniprot_id\n" + "\n".join(ids) + "\n", encoding="utf8")
+    output_csv = tmp_path / "out.csv"
+    uu.process(str(input_csv), str(output_csv), data_dir=str(data_dir), workers=2, lookahead=2)
+
+    df = pd.read_csv(output_csv, dtype=str)
+    assert list(df["uniprot_id"]) == ids
+    assert sorted(fetched) == ["P00001", "P00002", "P00003"]
+    assert all((data_dir / f"{uid}.json").exists() for uid in set(ids))
+
+
+def test_collect_info_refetches_truncated_cache(tmp_path: Path, monkeypatch) -> None:
+    uid = "Q99558"
+    text = (DATA_DIR / f"{uid}.json").read_text(encoding="utf8")
+    data_dir = tmp_path / "uniprot"
+    data_dir.mkdir()
+    (data_dir / f"{uid}.json").write_text(text[: len(text) // 2], encoding="utf8")
+
+    monkeypatch.setattr(uu, "fetch_uniprot", lambda uniprot_id: json.loads(text))
+    info = uu.collect_info(uid, data_dir=str(data_dir), secondary_names={})
+
+    assert info["genus"] == "Homo"
+    assert json.loads((data_dir / f"{uid}.json").read_text(encoding="utf8")) == json.loads(text)
+    assert not list(data_dir.glob("*.tmp"))
+
+
+def test_refresh_cache_updates_changed_entries(tmp_path: Path, monkeypatch) -> None:
+    sample = json.loads((DATA_DIR / "Q99558.json").read_text(encoding="utf8"))
+    data_dir = tmp_path / "uniprot"
+    data_dir.mkdir()
+    for acc in ("Q99558", "P00001", "P00002", "P00003"):
+        (data_dir / f"{acc}.json").write_text(
+            json.dumps(dict(sample, primaryAccession=acc)), encoding="utf8"
+        )
+    (data_dir / uu.SECONDARY_NAMES_FILE).write_text("{}", encoding="utf8")
+    newer = dict(sample["entryAudit"], entryVersion=226)
+    versions = {
+        "Q99558": {"primaryAccession": "Q99558", "entryAudit": sample["entryAudit"]},
+        "P00001": {"primaryAccession": "P00001", "entryAudit": newer},
+        "P00002": {"primaryAccession": "P99999", "entryAudit": newer},
+        "P00003": {},
+    }
+    calls: list[tuple[list[str], str | None]] = []
+
+    def fake_batch(accessions, *, chunk_size=100, fields=None):
+        accessions = list(accessions)
+        calls.append((accessions, fields))
+        if fields:
+            return {acc: versions[acc] for acc in accessions}
+        return {acc: dict(sample, primaryAccession=acc, entryAudit=newer) for acc in accessions}
+
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", fake_batch)
+    report = uu.refresh_cache(str(data_dir))
+
+    statuses = {row["uniprot_id"]: row["status"] for row in report}
+    assert statuses == {"P00001": "updated", "P00002": "merged", "P00003": "obsolete"}
+    assert calls[1][0] == ["P00001", "P00002"]
+    refreshed = json.loads((data_dir / "P00001.json").read_text(encoding="utf8"))
+    assert refreshed["entryAudit"]["entryVersion"] == 226
+
+
+def test_projected_cache_entry_refetched_for_full_request(tmp_path: Path, monkeypatch) -> None:
+    uid = "Q99558"
+    sample = json.loads((DATA_DIR / f"{uid}.json").read_text(encoding="utf8"))
+    requested: list[str | None] = []
+
+    def fake_fetch(uniprot_id: str, fields: str | None = None) -> dict:
+        requested.append(fields)
+        return dict(sample)
+
+    monkeypatch.setattr(uu, "fetch_uniprot", fake_fetch)
+    data_dir = tmp_path / "uniprot"
+    uu.collect_info(uid, str(data_dir), secondary_names={}, fields=uu.EXTRACTOR_FIELDS)
+    cached = json.loads((data_dir / f"{uid}.json").read_text(encoding="utf8"))
+    assert cached[uu.FIELDS_MARKER] == uu.EXTRACTOR_FIELDS
+
+    uu.collect_info(uid, str(data_dir), secondary_names={}, fields=uu.EXTRACTOR_FIELDS)
+    assert requested == [uu.EXTRACTOR_FIELDS]
+
+    info = uu.collect_info(uid, str(data_dir), secondary_names={})
+    assert requested == [uu.EXTRACTOR_FIELDS, None]
+    assert info["genus"] == "Homo"
+    cached = json.loads((data_dir / f"{uid}.json").read_text(encoding="utf8"))
+    assert uu.FIELDS_MARKER not in cached
+
+
+def test_process_prefetches_stale_projections(tmp_path: Path, monkeypatch) -> None:
+    uid = "Q99558"
+    sample = json.loads((DATA_DIR / f"{uid}.json").read_text(encoding="utf8"))
+    data_dir = tmp_path / "uniprot"
+    data_dir.mkdir()
+    (data_dir / f"{uid}.json").write_text(
+        json.dumps(dict(sample, **{uu.FIELDS_MARKER: uu.EXTRACTOR_FIELDS})), encoding="utf8"
+    )
+    threads: list[str] = []
+
+    def fake_fetch(uniprot_id: str, fields: str | None = None) -> dict:
+        threads.append(threading.current_thread().name)
+        return dict(sample)
+
+    monkeypatch.setattr(uu, "fetch_uniprot", fake_fetch)
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", lambda accessions, **kw: {})
+    input_csv = tmp_path / "uids.csv"
+    input_csv.write_text(f"uniprot_id\n{uid}\n", encoding="utf8")
+    output_csv = tmp_path / "out.csv"
+    uu.process(str(input_csv), str(output_csv), data_dir=str(data_dir), workers=2)
+
+    assert len(threads) == 1
+    assert threads[0] != threading.main_thread().name
+    cached = json.loads((data_dir / f"{uid}.json").read_text(encoding="utf8"))
+    assert uu.FIELDS_MARKER not in cached
+
+    uu.process(
+        str(input_csv),
+        str(output_csv),
+        data_dir=str(data_dir),
+        workers=2,
+        fields=uu.EXTRACTOR_FIELDS,
+    )
+    assert len(threads) == 1
+
+
+def test_process_resolves_stale_accessions(tmp_path: Path, monkeypatch) -> None:
+    data_dir = tmp_path / "uniprot"
+    data_dir.mkdir()
+    (data_dir / "Q99558.json").write_text(
+        (DATA_DIR / "Q99558.json").read_text(encoding="utf8"), encoding="utf8"
+    )
+    jobs: list[list[str]] = []
+
+    def fake_mapping(chunk):
+        jobs.append(list(chunk))
+        return {"A8K2D8": "Q99558", "P00000": ""}
+
+    def fail_fetch(uniprot_id: str) -> dict:
+        raise AssertionError(f"unexpected download of {uniprot_id}")
+
+    monkeypatch.setattr(uu, "_idmapping_chunk", fake_mapping)
+    monkeypatch.setattr(uu, "fetch_uniprot", fail_fetch)
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", lambda accessions, **kw: {})
+    input_csv = tmp_path / "uids.csv"
+    input_csv.write_text("uniprot_id\nA8K2D8\nP00000\n", encoding="utf8")
+    output_csv = tmp_path / "out.csv"
+    uu.process(str(input_csv), str(output_csv), data_dir=str(data_dir), resolve=True)
+
+    df = pd.read_csv(output_csv, dtype=str, keep_default_na=False)
+    assert list(df.columns[:2]) == ["uniprot_id", "current_uniprot_id"]
+    assert list(df["uniprot_id"]) == ["A8K2D8", "P00000"]
+    assert list(df["current_uniprot_id"]) == ["Q99558", ""]
+    assert df.loc[0, "genus"] == "Homo"
+    assert df.loc[1, "names"] == ""
+
+    uu.process(str(input_csv), str(output_csv), data_dir=str(data_dir), resolve=True)
+    assert jobs == [["A8K2D8", "P00000"]]
+
+
+def test_process_parquet_output_requires_pyarrow(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(uu, "pa", None)
+    input_csv = tmp_path / "uids.csv"
+    input_csv.write_text("uniprot_id\nQ99558\n", encoding="utf8")
+    with pytest.raises(ValueError, match="pyarrow"):
+        uu.process(
+            str(input_csv),
+            str(tmp_path / "out.parquet"),
+            data_dir=str(DATA_DIR),
+            output_format="parquet",
+        )
+
+
+def test_process_parquet_output_types(tmp_path: Path, monkeypatch) -> None:
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", lambda accessions, **kw: {})
+    input_csv = tmp_path / "uids.csv"
+    input_csv.write_text("uniprot_id\nQ99558\n", encoding="utf8")
+    csv_out = tmp_path / "out.csv"
+    parquet_out = tmp_path / "out.parquet"
+    uu.process(str(input_csv), str(csv_out), data_dir=str(DATA_DIR))
+    uu.process(
+        str(input_csv), str(parquet_out), data_dir=str(DATA_DIR), output_format="parquet"
+    )
+
+    text = pd.read_csv(csv_out, dtype=str, keep_default_na=False).iloc[0]
+    table = pd.read_parquet(parquet_out)
+    row = table.iloc[0]
+    assert list(row["names"]) == text["names"].split("|")
+    assert list(row["secondaryAccessions"]) == text["secondaryAccessions"].split("|")
+    assert row["transmembrane"] == (text["transmembrane"] == "True")
+    assert isinstance(table["genus"].dtype, pd.CategoricalDtype)
+    assert row["genus"] == "Homo"
+
+
+def test_collect_info_shares_repeated_values() -> None:
+    sample = json.loads((DATA_DIR / "Q99558.json").read_text(encoding="utf8"))
+    # Decode twice so the two entries hold distinct but equal strings.
+    other = json.loads(json.dumps(sample))
+    with uu._shared_values():
+        first = uu.collect_info("Q99558", entry=sample, secondary_names={})
+        second = uu.collect_info("Q99558", entry=other, secondary_names={})
+    assert first == second
+    for column in ("genus", "superkingdom", "molecular_function", "topology"):
+        assert first[column] is second[column]
+    # Nothing is retained once the batch is done.
+    assert not uu._TAXONOMY and not uu._KEYWORDS and not uu._STRINGS
+    uu.collect_info("Q99558", entry=sample, secondary_names={})
+    assert not uu._TAXONOMY and not uu._STRINGS
+
+
+def test_extract_organism_keys_taxonomy_on_lineage() -> None:
+    organism = {"taxonId": 9606, "scientificName": "Homo sapiens"}
+    full = {"organism": dict(organism, lineage=["Eukaryota", "Metazoa", "Chordata", "Homo"])}
+    partial = {"organism": organism}
+    with uu._shared_values():
+        assert uu.extract_organism(full)["phylum"] == "Chordata"
+        assert uu.extract_organism(partial) == {
+            "genus": "Homo",
+            "superkingdom": "",
+            "phylum": "",
+            "taxon_id": "9606",
+        }
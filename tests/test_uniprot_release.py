@@ -0,0 +1,82 @@
+from pathlib import Path
+import sys
+import gzip
+import json
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from library import uniprot_library as uu
+from library.uniprot_release import UniProtRelease
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "uniprot"
+
+
+def _entries() -> list[dict]:
+    sample = json.loads((DATA_DIR / "Q99558.json").read_text(encoding="utf8"))
+    other = dict(sample, primaryAccession="P99999", secondaryAccessions=["Q00001"])
+    return [other, sample]
+
+
+def _write_release(path: Path, compressed: bool) -> None:
+    lines = [json.dumps(entry).encode() + b"\n" for entry in _entries()]
+    if compressed:
+        # One gzip member per entry, as produced by bgzip.
+        path.write_bytes(b"".join(gzip.compress(line) for line in lines))
+    else:
+        path.write_bytes(b"".join(lines))
+
+
+@pytest.mark.parametrize("name", ["release.jsonl", "release.jsonl.gz"])
+def test_release_get_by_primary_and_secondary(tmp_path: Path, name: str) -> None:
+    path = tmp_path / name
+    _write_release(path, name.endswith(".gz"))
+    with UniProtRelease(str(path)) as release:
+        assert release.get("Q99558")["primaryAccession"] == "Q99558"
+        assert release.get("A8K2D8")["primaryAccession"] == "Q99558"
+        assert release.get("Q00001")["primaryAccession"] == "P99999"
+        assert release.get("P00000") == {}
+        assert "P99999" in release
+    assert (tmp_path / f"{name}.idx").exists()
+
+
+def test_release_rebuilds_outdated_index(tmp_path: Path) -> None:
+    path = tmp_path / "release.jsonl"
+    _write_release(path, False)
+    UniProtRelease(str(path)).close()
+    path.write_text(json.dumps(_entries()[0]) + "\n", encoding="utf8")
+    with UniProtRelease(str(path)) as release:
+        assert "Q99558" not in release
+        assert release.get("P99999")["primaryAccession"] == "P99999"
+
+
+def test_process_reads_release_offline(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "release.jsonl.gz"
+    _write_release(path, True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unexpected network access")
+
+    monkeypatch.setattr(uu, "fetch_uniprot", fail)
+    monkeypatch.setattr(uu, "fetch_uniprot_batch", fail)
+    monkeypatch.setattr(uu, "_idmapping_chunk", fail)
+    data_dir = tmp_path / "uniprot"
+    input_csv = tmp_path / "uids.csv"
+    input_csv.write_text("uniprot_id\nQ99558\nA8K2D8\nP00000\n", encoding="utf8")
+    output_csv = tmp_path / "out.csv"
+    with UniProtRelease(str(path)) as release:
+        uu.process(
+            str(input_csv),
+            str(output_csv),
+            data_dir=str(data_dir),
+            resolve=True,
+            release=release,
+        )
+
+    df = pd.read_csv(output_csv, dtype=str, keep_default_na=False)
+    assert list(df["current_uniprot_id"]) == ["Q99558", "Q99558", ""]
+    assert df.loc[0, "genus"] == "Homo"
+    assert df.loc[1, "names"] == df.loc[0, "names"]
+    assert df.loc[2, "names"] == ""
+    assert not data_dir.exists()